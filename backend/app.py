@@ -1,14 +1,82 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
-from config import Config
+from werkzeug.security import check_password_hash
+from config import config
 from models import db
+from utils.json_provider import OrjsonProvider
+import hmac
+import importlib
 import logging
 import os
+import secrets
+import threading
+from collections import OrderedDict
 
-def create_app(config_class=Config):
+# (module path, blueprint attribute) pairs registered by create_app
+BLUEPRINTS = [
+    ('routes.upload_routes', 'upload_bp'),
+    ('routes.evaluation_routes', 'evaluation_bp'),
+]
+
+def _register_blueprint(app, module_path, bp_name):
+    """Import a blueprint module by path and register its blueprint.
+
+    Imported at app creation on purpose: with gunicorn's ``preload_app`` the
+    route modules and their heavy dependencies load once in the master.
+    """
+    module = importlib.import_module(module_path)
+    app.register_blueprint(getattr(module, bp_name))
+
+# Checked against unknown usernames so lookups take the same time either way
+_DUMMY_PASSWORD_HASH = 'pbkdf2:sha256:600000$fi9stn0QBPBEVIEe$36934f1343d64d9cf0ab6c29525da496926eeb29b9ebc672e9a6b4138b5ce23e'
+_MAX_VERIFIED_LOGINS = 128
+# (username, stored hash) -> HMAC of the last password verified for it, least
+# recently used first. The key is random per process, so the memo never holds
+# plain or crackable hashes of the credentials.
+_LOGIN_MEMO_KEY = secrets.token_bytes(32)
+_verified_logins = OrderedDict()
+_verified_logins_lock = threading.Lock()
+
+def _check_placement_password(placement_users, username, password):
+    """Verify placement credentials, memoizing successful checks by keyed password digest"""
+    stored_hash = placement_users.get(username)
+    if not stored_hash:
+        check_password_hash(_DUMMY_PASSWORD_HASH, password)
+        return False
+    
+    digest = hmac.new(_LOGIN_MEMO_KEY, password.encode('utf-8'), 'sha256').digest()
+    key = (username, stored_hash)
+    with _verified_logins_lock:
+        verified = _verified_logins.get(key)
+        if verified is not None and hmac.compare_digest(verified, digest):
+            _verified_logins.move_to_end(key)
+            return True
+    
+    if not check_password_hash(stored_hash, password):
+        return False
+    
+    with _verified_logins_lock:
+        _verified_logins[key] = digest
+        _verified_logins.move_to_end(key)
+        if len(_verified_logins) > _MAX_VERIFIED_LOGINS:
+            _verified_logins.popitem(last=False)
+    return True
+
+def warmup():
+    """Load read-only, fork-safe state (NLP models, compiled patterns) up front.
+
+    Called from create_app so that with ``gunicorn --preload`` the work happens
+    once in the master and workers share the pages copy-on-write. Nothing here
+    may open sockets, DB connections or file handles.
+    """
+    importlib.import_module('models_nlp')
+
+def create_app(config_class=config):
     """Application factory pattern"""
     app = Flask(__name__)
-    app.config.from_object(config_class)
+    # Config exposes lazy properties, so classes must be instantiated before loading
+    app.config.from_object(config_class() if isinstance(config_class, type) else config_class)
+    app.json = OrjsonProvider(app)
     
     # Initialize extensions
     db.init_app(app)
@@ -21,9 +89,11 @@ def create_app(config_class=Config):
     )
     
     # Register blueprints
-    from routes import upload_bp, evaluation_bp
-    app.register_blueprint(upload_bp)
-    app.register_blueprint(evaluation_bp)
+    for module_path, bp_name in BLUEPRINTS:
+        _register_blueprint(app, module_path, bp_name)
+    
+    # Populate shared read-only state before a preloading server forks
+    warmup()
     
     # Create upload directory
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -41,14 +111,14 @@ def create_app(config_class=Config):
     @app.route('/auth/placement', methods=['POST'])
     def authenticate_placement():
         from flask import request
-        data = request.get_json()
-        username = data.get('username')
-        password = data.get('password')
+        data = request.get_json(silent=True) or {}
+        username = data.get('username') or ''
+        password = data.get('password') or ''
         
         # Simple authentication (replace with proper auth in production)
         placement_users = app.config.get('PLACEMENT_USERS', {})
         
-        if username in placement_users and placement_users[username] == password:
+        if _check_placement_password(placement_users, username, password):
             return jsonify({
                 'success': True,
                 'message': 'Authentication successful',
@@ -77,13 +147,51 @@ def create_app(config_class=Config):
     def file_too_large(error):
         return jsonify({'error': 'File too large. Maximum size is 16MB'}), 413
     
-    # Create database tables
-    with app.app_context():
-        try:
-            db.create_all()
-            logging.info("Database tables created successfully")
-        except Exception as e:
-            logging.error(f"Error creating database tables: {str(e)}")
+    # Database setup: run `flask --app app init-db` once per deployment
+    @app.cli.command('init-db')
+    def init_db():
+        """Create database tables"""
+        db.create_all()
+        logging.info("Database tables created successfully")
+    
+    # Fit the TF-IDF vocabulary used by the matcher: `flask --app app fit-tfidf`,
+    # then restart workers so they load it
+    @app.cli.command('fit-tfidf')
+    def fit_tfidf():
+        """Fit TF-IDF on stored job descriptions and resumes"""
+        from itertools import chain
+        from sqlalchemy import select
+        from models import Job, Resume
+        from services.matcher import ResumeJobMatcher
+        
+        corpus = chain(
+            db.session.execute(
+                select(Job.description).execution_options(yield_per=500)
+            ).scalars(),
+            db.session.execute(
+                select(Resume.content_text).where(Resume.content_text.is_not(None))
+                .execution_options(yield_per=500)
+            ).scalars()
+        )
+        vocabulary_size = ResumeJobMatcher().fit_tfidf(corpus)
+        logging.info(f"Fitted TF-IDF vocabulary of {vocabulary_size} terms")
+    
+    # Recreate the vector index with the tuned HNSW parameters; run off-hours
+    @app.cli.command('rebuild-vector-index')
+    def rebuild_vector_index():
+        """Rebuild the ChromaDB collection with the configured HNSW parameters"""
+        from utils.embeddings import EmbeddingManager
+        
+        EmbeddingManager().rebuild_collection()
+    
+    # Optional auto-create for local development
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            try:
+                db.create_all()
+                logging.info("Database tables created successfully")
+            except Exception as e:
+                logging.error(f"Error creating database tables: {str(e)}")
     
     return app
 
@@ -0,0 +1,23 @@
+# Gunicorn configuration: gunicorn -c gunicorn.conf.py
+import os
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Load the app (and its NLP models) once in the master; workers share the
+# read-only pages copy-on-write.
+preload_app = True
+# Each worker also starts MATCH_PROCESSES matcher processes (services/pipeline.py),
+# cpu_count // WEB_CONCURRENCY by default, so workers * MATCH_PROCESSES ~ cores.
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = 120
+
+def post_fork(server, worker):
+    # Drop any pooled DB connections inherited from the master so each worker
+    # opens its own.
+    from app import app
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
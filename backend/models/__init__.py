@@ -1,10 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import JSONB
 
 db = SQLAlchemy()
 
+# JSON columns are stored as binary JSONB on Postgres so they can be GIN-indexed
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
+
 from .student import Student
 from .resume import Resume
 from .job import Job
 from .evaluation import Evaluation
+from .llm_cache import LLMCache
+from .skill import Skill, JobSkill, ResumeSkill
+from .task import EvaluationTask
 
-__all__ = ['db', 'Student', 'Resume', 'Job', 'Evaluation']
\ No newline at end of file
+__all__ = ['db', 'Student', 'Resume', 'Job', 'Evaluation', 'LLMCache', 'Skill', 'JobSkill', 'ResumeSkill', 'EvaluationTask']
\ No newline at end of file
@@ -1,40 +1,143 @@
-from . import db
+from . import db, JSONType
+from .mixins import SerializableMixin
 from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+import operator
+from sqlalchemy.ext.hybrid import hybrid_property, Comparator
 
-class Evaluation(db.Model):
+# Scores are stored as SMALLINT hundredths (0-10000) instead of 8-byte floats
+SCORE_SCALE = 100
+FIXED_POINT_COLUMNS = ('relevance_score', 'keyword_score', 'semantic_score')
+
+_COMPARISON_OPS = {operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge}
+
+class _FixedPointComparator(Comparator):
+    """SQL side of a fixed-point score.
+
+    Comparisons against numbers are rewritten to hit the raw integer column
+    (so indexes stay usable); anything else sees the float score.
+    """
+    
+    def __init__(self, column):
+        self.column = column
+        super().__init__(db.cast(column, db.Float) / SCORE_SCALE)
+    
+    def operate(self, op, *other, **kwargs):
+        if op in _COMPARISON_OPS and len(other) == 1 and isinstance(other[0], (int, float)):
+            return op(self.column, other[0] * SCORE_SCALE)
+        return op(self.expression, *other, **kwargs)
+
+def _to_fixed_point(value):
+    """Score as hundredths, clamped to the 0-100 range the columns accept"""
+    if value is None:
+        return None
+    return min(max(int(round(value * SCORE_SCALE)), 0), 100 * SCORE_SCALE)
+
+def _fixed_point_score(attr):
+    """Expose the SMALLINT column ``attr`` as a float score"""
+    def fget(self):
+        value = getattr(self, attr)
+        return value / SCORE_SCALE if value is not None else None
+    
+    def fset(self, value):
+        setattr(self, attr, _to_fixed_point(value))
+    
+    return hybrid_property(fget, fset).comparator(
+        lambda cls: _FixedPointComparator(getattr(cls, attr))
+    )
+
+class Evaluation(SerializableMixin, db.Model):
     __tablename__ = 'evaluations'
     
-    id = db.Column(db.Integer, primary_key=True)
-    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    resume_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
+    job_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
     
-    # Scores
-    relevance_score = db.Column(db.Float, nullable=False)
-    keyword_score = db.Column(db.Float, nullable=True)
-    semantic_score = db.Column(db.Float, nullable=True)
+    # Scores (0-100, stored x100 as SMALLINT)
+    _relevance_score_x100: Mapped[int] = mapped_column('relevance_score', db.SmallInteger, nullable=False)
+    _keyword_score_x100: Mapped[Optional[int]] = mapped_column('keyword_score', db.SmallInteger, nullable=True)
+    _semantic_score_x100: Mapped[Optional[int]] = mapped_column('semantic_score', db.SmallInteger, nullable=True)
+    relevance_score = _fixed_point_score('_relevance_score_x100')
+    keyword_score = _fixed_point_score('_keyword_score_x100')
+    semantic_score = _fixed_point_score('_semantic_score_x100')
     
     # Verdict
-    verdict = db.Column(db.String(20), nullable=False)  # High, Medium, Low
+    verdict: Mapped[str] = mapped_column(db.String(20), nullable=False)  # High, Medium, Low
     
     # Missing Elements
-    missing_skills = db.Column(db.JSON, nullable=True)
-    missing_projects = db.Column(db.JSON, nullable=True)
-    missing_certifications = db.Column(db.JSON, nullable=True)
-    missing_experience = db.Column(db.JSON, nullable=True)
+    missing_skills: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    missing_projects: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    missing_certifications: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    missing_experience: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
     
     # Feedback
-    feedback = db.Column(db.Text, nullable=True)
-    improvement_suggestions = db.Column(db.JSON, nullable=True)
+    feedback: Mapped[Optional[str]] = mapped_column(db.Text, nullable=True)
+    improvement_suggestions: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
     
     # Skill Matching Details
-    matched_skills = db.Column(db.JSON, nullable=True)
-    skill_gaps = db.Column(db.JSON, nullable=True)
+    matched_skills: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    skill_gaps: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
     
     # Metadata
-    evaluation_date = db.Column(db.DateTime, default=datetime.utcnow)
-    processing_time = db.Column(db.Float, nullable=True)  # seconds
+    evaluation_date: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
+    processing_time: Mapped[Optional[float]] = mapped_column(db.Float, nullable=True)  # seconds
+    
+    # Indexes for dashboard lookups (top candidates per job, per-resume history)
+    __table_args__ = (
+        db.CheckConstraint('relevance_score BETWEEN 0 AND 10000', name='ck_eval_relevance_score_range'),
+        db.CheckConstraint('keyword_score BETWEEN 0 AND 10000', name='ck_eval_keyword_score_range'),
+        db.CheckConstraint('semantic_score BETWEEN 0 AND 10000', name='ck_eval_semantic_score_range'),
+        db.Index('ix_eval_job_score_desc', job_id, _relevance_score_x100.desc()),
+        db.Index('ix_eval_job_verdict', job_id, verdict),
+        db.Index('ix_eval_resume', resume_id),
+        db.Index('ix_eval_verdict_date', verdict, evaluation_date.desc()),
+        # Default /evaluation ordering and its keyset cursor
+        db.Index('ix_eval_date_id', evaluation_date.desc(), id.desc()),
+        # High performers (score >= 75) counted by /stats
+        db.Index('ix_eval_high', _relevance_score_x100, postgresql_where=_relevance_score_x100 >= 75 * SCORE_SCALE),
+    )
+    
+    @classmethod
+    def bulk_create(cls, rows):
+        """Insert many evaluations in one executemany round-trip.
+
+        ``rows`` are dicts keyed like the constructor arguments (float scores).
+        The caller owns the transaction and commits.
+        """
+        if not rows:
+            return
+        db.session.execute(db.insert(cls), [cls._fixed_point_row(row) for row in rows])
+    
+    @classmethod
+    def bulk_update(cls, rows):
+        """Update many evaluations by primary key in one executemany round-trip.
+
+        ``rows`` are dicts holding ``id`` plus the attributes to change (float
+        scores). The caller owns the transaction and commits.
+        """
+        if not rows:
+            return
+        db.session.execute(db.update(cls), [cls._fixed_point_row(row) for row in rows])
+    
+    @staticmethod
+    def _fixed_point_row(row):
+        """Copy of ``row`` with float scores mapped (and clamped) onto the SMALLINT columns"""
+        row = dict(row)
+        for name in FIXED_POINT_COLUMNS:
+            if name in row:
+                row[f'_{name}_x100'] = _to_fixed_point(row.pop(name))
+        return row
+    
+    @classmethod
+    def _serialized_select_columns(cls):
+        return [
+            (db.cast(column, db.Float) / SCORE_SCALE).label(column.key)
+            if column.key in FIXED_POINT_COLUMNS else column
+            for column in super()._serialized_select_columns()
+        ]
     
-    def to_dict(self):
+    def _build_dict(self):
         return {
             'id': self.id,
             'resume_id': self.resume_id,
@@ -51,6 +154,6 @@ class Evaluation(db.Model):
             'improvement_suggestions': self.improvement_suggestions,
             'matched_skills': self.matched_skills,
             'skill_gaps': self.skill_gaps,
-            'evaluation_date': self.evaluation_date.isoformat() if self.evaluation_date else None,
+            'evaluation_date': self.evaluation_date,
             'processing_time': self.processing_time
         }
\ No newline at end of file
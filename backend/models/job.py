@@ -1,39 +1,58 @@
-from . import db
-from datetime import datetime
+from . import db, JSONType
+from .mixins import SerializableMixin
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-class Job(db.Model):
+class Job(SerializableMixin, db.Model):
     __tablename__ = 'jobs'
     
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(200), nullable=False)
-    company = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text, nullable=False)
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(db.String(200), nullable=False)
+    company: Mapped[str] = mapped_column(db.String(200), nullable=False)
+    description: Mapped[str] = mapped_column(db.Text, nullable=False)
     
     # Job Details
-    location = db.Column(db.String(100), nullable=True)
-    job_type = db.Column(db.String(50), nullable=True)  # Full-time, Internship, etc.
-    experience_level = db.Column(db.String(50), nullable=True)
-    salary_range = db.Column(db.String(100), nullable=True)
-    department = db.Column(db.String(100), nullable=True)
+    location: Mapped[Optional[str]] = mapped_column(db.String(100), nullable=True)
+    job_type: Mapped[Optional[str]] = mapped_column(db.String(50), nullable=True)  # Full-time, Internship, etc.
+    experience_level: Mapped[Optional[str]] = mapped_column(db.String(50), nullable=True)
+    salary_range: Mapped[Optional[str]] = mapped_column(db.String(100), nullable=True)
+    department: Mapped[Optional[str]] = mapped_column(db.String(100), nullable=True)
     
     # Requirements
-    required_skills = db.Column(db.JSON, nullable=True)
-    preferred_skills = db.Column(db.JSON, nullable=True)
-    education_requirements = db.Column(db.JSON, nullable=True)
-    min_experience = db.Column(db.String(50), nullable=True)
-    certifications = db.Column(db.JSON, nullable=True)
-    languages = db.Column(db.String(200), nullable=True)
+    required_skills: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    preferred_skills: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    education_requirements: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    min_experience: Mapped[Optional[str]] = mapped_column(db.String(50), nullable=True)
+    certifications: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    languages: Mapped[Optional[str]] = mapped_column(db.String(200), nullable=True)
     
     # Metadata
-    application_deadline = db.Column(db.Date, nullable=True)
-    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
-    uploaded_by = db.Column(db.String(100), nullable=True)  # placement team member
-    status = db.Column(db.String(20), default='active')  # active, inactive, closed
+    application_deadline: Mapped[Optional[date]] = mapped_column(db.Date, nullable=True)
+    upload_date: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
+    uploaded_by: Mapped[Optional[str]] = mapped_column(db.String(100), nullable=True)  # placement team member
+    status: Mapped[Optional[str]] = mapped_column(db.String(20), default='active')  # active, inactive, closed
+    
+    # Matcher artifacts computed once at upload (see ResumeJobMatcher.preprocess_job)
+    parsed_cache: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
+    
+    __table_args__ = (
+        db.Index('ix_job_status_deadline', status, application_deadline),
+        db.Index('ix_job_required_skills_gin', required_skills, postgresql_using='gin'),
+    )
+    
+    _serialized_columns = (
+        'id', 'title', 'company', 'description', 'location', 'job_type',
+        'experience_level', 'salary_range', 'department', 'required_skills',
+        'preferred_skills', 'education_requirements', 'min_experience',
+        'certifications', 'languages', 'application_deadline', 'upload_date',
+        'uploaded_by', 'status'
+    )
     
     # Relationships
-    evaluations = db.relationship('Evaluation', backref='job', lazy=True, cascade='all, delete-orphan')
+    evaluations: Mapped[List['Evaluation']] = relationship('Evaluation', backref='job', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def _build_dict(self):
         return {
             'id': self.id,
             'title': self.title,
@@ -50,8 +69,8 @@ class Job(db.Model):
             'min_experience': self.min_experience,
             'certifications': self.certifications,
             'languages': self.languages,
-            'application_deadline': self.application_deadline.isoformat() if self.application_deadline else None,
-            'upload_date': self.upload_date.isoformat() if self.upload_date else None,
+            'application_deadline': self.application_deadline,
+            'upload_date': self.upload_date,
             'uploaded_by': self.uploaded_by,
             'status': self.status
         }
\ No newline at end of file
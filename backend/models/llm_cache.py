@@ -0,0 +1,40 @@
+from . import db
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from hashlib import sha256
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+class LLMCache(db.Model):
+    """Persistent cache of LLM responses keyed by a hash of the prompt inputs"""
+    __tablename__ = 'llm_cache'
+    
+    key_hash: Mapped[str] = mapped_column(db.String(64), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(db.String(20), nullable=False)
+    response: Mapped[str] = mapped_column(db.Text, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    
+    # Cache reads/writes use their own connection so a failure never
+    # poisons the caller's session (which may hold pending evaluations).
+    @classmethod
+    def lookup(cls, key_hash: str):
+        with db.engine.connect() as conn:
+            return conn.execute(
+                select(cls.response).where(cls.key_hash == key_hash)
+            ).scalar()
+    
+    @classmethod
+    def store(cls, key_hash: str, prompt_version: str, response: str):
+        stmt = insert(cls).values(
+            key_hash=key_hash,
+            prompt_version=prompt_version,
+            response=response,
+            created_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=['key_hash'])
+        with db.engine.begin() as conn:
+            conn.execute(stmt)
@@ -0,0 +1,78 @@
+import orjson
+from flask import g
+from sqlalchemy import event, select
+from . import db
+
+class SerializableMixin:
+    """Caches the ``to_dict()`` payload until the instance changes.
+
+    Subclasses implement ``_build_dict()``. The cached dict is dropped when a
+    public attribute is assigned or when SQLAlchemy expires/refreshes the row.
+    Nested list/dict values of ``to_dict()`` are shared with the cache and
+    are read-only. ``_serialized_columns`` limits the columns returned by
+    ``serialized_rows()`` (all table columns when ``None``).
+    """
+    
+    _serialized_columns = None
+    
+    def to_dict(self):
+        cached = self.__dict__.get('_dict_cache')
+        if cached is None:
+            cached = self._build_dict()
+            self.__dict__['_dict_cache'] = cached
+        # Shallow copy so callers can add keys without touching the cache;
+        # nested JSON lists/dicts are shared with it and must not be mutated
+        return dict(cached)
+    
+    @classmethod
+    def cached_get(cls, pk):
+        """Get an instance by primary key, memoized on ``flask.g`` for the current request"""
+        store = g.setdefault('_id_cache', {})
+        key = (cls.__name__, pk)
+        if key not in store:
+            store[key] = db.session.get(cls, pk)
+        return store[key]
+    
+    @classmethod
+    def _serialized_select_columns(cls):
+        """Column expressions selected by ``serialized_rows()``"""
+        table = cls.__table__
+        names = cls._serialized_columns or table.c.keys()
+        return [table.c[name] for name in names]
+    
+    @classmethod
+    def serialized_rows(cls, *criteria, order_by=None, offset=None, limit=None):
+        """Fetch serialized columns as plain dicts, bypassing ORM instances"""
+        stmt = select(*cls._serialized_select_columns()).where(*criteria)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [dict(row) for row in db.session.execute(stmt).mappings()]
+    
+    @classmethod
+    def list_as_json(cls, *criteria, **kwargs):
+        """Serialize matching rows straight to JSON bytes"""
+        return orjson.dumps(cls.serialized_rows(*criteria, **kwargs))
+    
+    def invalidate_dict_cache(self):
+        self.__dict__.pop('_dict_cache', None)
+    
+    def __setattr__(self, name, value):
+        if not name.startswith('_'):
+            self.__dict__.pop('_dict_cache', None)
+        super().__setattr__(name, value)
+
+@event.listens_for(SerializableMixin, 'expire', propagate=True)
+def _on_expire(target, attrs):
+    target.invalidate_dict_cache()
+
+@event.listens_for(SerializableMixin, 'refresh', propagate=True)
+def _on_refresh(target, context, attrs):
+    target.invalidate_dict_cache()
+
+@event.listens_for(SerializableMixin, 'refresh_flush', propagate=True)
+def _on_refresh_flush(target, flush_context, attrs):
+    target.invalidate_dict_cache()
@@ -1,34 +1,48 @@
-from . import db
+from . import db, JSONType
+from .mixins import SerializableMixin
 from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-class Resume(db.Model):
+class Resume(SerializableMixin, db.Model):
     __tablename__ = 'resumes'
     
-    id = db.Column(db.Integer, primary_key=True)
-    filename = db.Column(db.String(255), nullable=False)
-    original_filename = db.Column(db.String(255), nullable=False)
-    file_path = db.Column(db.String(500), nullable=False)
-    content_text = db.Column(db.Text, nullable=True)
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    filename: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    original_filename: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(db.String(500), nullable=False)
+    content_text: Mapped[Optional[str]] = mapped_column(db.Text, nullable=True)
     
     # Parsed Information
-    extracted_skills = db.Column(db.JSON, nullable=True)
-    extracted_experience = db.Column(db.JSON, nullable=True)
-    extracted_education = db.Column(db.JSON, nullable=True)
-    extracted_projects = db.Column(db.JSON, nullable=True)
-    extracted_certifications = db.Column(db.JSON, nullable=True)
+    extracted_skills: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    extracted_experience: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    extracted_education: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    extracted_projects: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    extracted_certifications: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
     
     # Student Information
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=True)
+    student_id: Mapped[Optional[int]] = mapped_column(db.Integer, db.ForeignKey('students.id'), nullable=True)
     
     # Metadata
-    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
-    file_size = db.Column(db.Integer, nullable=True)
-    processing_status = db.Column(db.String(50), default='pending')  # pending, processed, error
+    upload_date: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
+    file_size: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
+    processing_status: Mapped[Optional[str]] = mapped_column(db.String(50), default='pending')  # pending, processed, error
+    
+    __table_args__ = (
+        db.Index('ix_resume_student_upload', student_id, upload_date.desc()),
+        db.Index('ix_resume_extracted_skills_gin', extracted_skills, postgresql_using='gin'),
+    )
+    
+    _serialized_columns = (
+        'id', 'filename', 'original_filename', 'extracted_skills', 'extracted_experience',
+        'extracted_education', 'extracted_projects', 'extracted_certifications',
+        'student_id', 'upload_date', 'processing_status'
+    )
     
     # Relationships
-    evaluations = db.relationship('Evaluation', backref='resume', lazy=True, cascade='all, delete-orphan')
+    evaluations: Mapped[List['Evaluation']] = relationship('Evaluation', backref='resume', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def _build_dict(self):
         return {
             'id': self.id,
             'filename': self.filename,
@@ -39,6 +53,6 @@ class Resume(db.Model):
             'extracted_projects': self.extracted_projects,
             'extracted_certifications': self.extracted_certifications,
             'student_id': self.student_id,
-            'upload_date': self.upload_date.isoformat() if self.upload_date else None,
+            'upload_date': self.upload_date,
             'processing_status': self.processing_status
         }
\ No newline at end of file
@@ -0,0 +1,103 @@
+from . import db
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import and_, select, func, true
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Longer "skills" are free-text entities from the parser, not skill names
+MAX_SKILL_NAME_LENGTH = 200
+
+def _insert(model):
+    """INSERT supporting ``on_conflict_do_nothing`` for the session's dialect (PostgreSQL or SQLite)"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+class Skill(db.Model):
+    """Canonical (lowercased) skill names shared by jobs and resumes"""
+    __tablename__ = 'skills'
+    
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(db.String(MAX_SKILL_NAME_LENGTH), unique=True, nullable=False)
+    
+    @staticmethod
+    def normalize(names: Iterable[str]) -> List[str]:
+        """Lowercase, strip and de-duplicate skill names, preserving order; overlong names are dropped"""
+        seen = {}
+        for name in names or []:
+            if isinstance(name, str) and 0 < len(name.strip()) <= MAX_SKILL_NAME_LENGTH:
+                seen.setdefault(name.strip().lower(), None)
+        return list(seen)
+    
+    @classmethod
+    def ids_for(cls, names: List[str]) -> Dict[str, int]:
+        """Return {name: id} for normalized names, inserting any that are new"""
+        if not names:
+            return {}
+        db.session.execute(
+            _insert(cls).values([{'name': name} for name in names])
+            .on_conflict_do_nothing(index_elements=['name'])
+        )
+        rows = db.session.execute(select(cls.name, cls.id).where(cls.name.in_(names)))
+        return dict(rows.all())
+    
+    @classmethod
+    def link_job(cls, job_id: int, required_skills: List[str], preferred_skills: List[str] = None):
+        """Write job_skills rows for a job (required with weight 1.0, preferred 0.5)"""
+        required = cls.normalize(required_skills)
+        preferred = [name for name in cls.normalize(preferred_skills) if name not in required]
+        skill_ids = cls.ids_for(required + preferred)
+        rows = [{'job_id': job_id, 'skill_id': skill_ids[name], 'weight': 1.0, 'required': True} for name in required]
+        rows += [{'job_id': job_id, 'skill_id': skill_ids[name], 'weight': 0.5, 'required': False} for name in preferred]
+        if rows:
+            db.session.execute(_insert(JobSkill).values(rows).on_conflict_do_nothing())
+    
+    @classmethod
+    def link_resume(cls, resume_id: int, skills: List[str]):
+        """Write resume_skills rows for a resume"""
+        skill_ids = cls.ids_for(cls.normalize(skills))
+        rows = [{'resume_id': resume_id, 'skill_id': skill_id} for skill_id in skill_ids.values()]
+        if rows:
+            db.session.execute(_insert(ResumeSkill).values(rows).on_conflict_do_nothing())
+    
+    @classmethod
+    def matched_counts(cls, resume_id: int, job_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        """Return {job_id: (required skills the resume has, required skills)} in one grouped query.
+
+        Jobs without required skills are absent from the result.
+        """
+        if not job_ids:
+            return {}
+        rows = db.session.execute(
+            select(JobSkill.job_id, func.count(ResumeSkill.skill_id), func.count())
+            .select_from(JobSkill)
+            .outerjoin(ResumeSkill, and_(
+                ResumeSkill.skill_id == JobSkill.skill_id,
+                ResumeSkill.resume_id == resume_id
+            ))
+            .where(JobSkill.job_id.in_(job_ids), JobSkill.required)
+            .group_by(JobSkill.job_id)
+        )
+        return {job_id: (matched, total) for job_id, matched, total in rows}
+
+class JobSkill(db.Model):
+    __tablename__ = 'job_skills'
+    
+    job_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    weight: Mapped[float] = mapped_column(db.Float, nullable=False, default=1.0)
+    required: Mapped[bool] = mapped_column(db.Boolean, nullable=False, default=True, server_default=true())
+    
+    __table_args__ = (
+        db.Index('ix_job_skills_skill', skill_id),
+    )
+
+class ResumeSkill(db.Model):
+    __tablename__ = 'resume_skills'
+    
+    resume_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_resume_skills_skill', skill_id),
+    )
@@ -1,25 +1,28 @@
 from . import db
+from .mixins import SerializableMixin
 from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-class Student(db.Model):
+class Student(SerializableMixin, db.Model):
     __tablename__ = 'students'
     
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    student_id = db.Column(db.String(50), unique=True, nullable=True)
-    graduation_year = db.Column(db.String(4), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(db.String(100), nullable=False)
+    email: Mapped[str] = mapped_column(db.String(120), unique=True, nullable=False)
+    student_id: Mapped[Optional[str]] = mapped_column(db.String(50), unique=True, nullable=True)
+    graduation_year: Mapped[Optional[str]] = mapped_column(db.String(4), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    resumes = db.relationship('Resume', backref='student', lazy=True, cascade='all, delete-orphan')
+    resumes: Mapped[List['Resume']] = relationship('Resume', backref='student', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def _build_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'email': self.email,
             'student_id': self.student_id,
             'graduation_year': self.graduation_year,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
\ No newline at end of file
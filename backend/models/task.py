@@ -0,0 +1,83 @@
+from . import db, JSONType
+from .mixins import SerializableMixin
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid import uuid4
+
+class EvaluationTask(SerializableMixin, db.Model):
+    """Status of a background evaluation run, shared by all worker processes"""
+    __tablename__ = 'evaluation_tasks'
+    
+    id: Mapped[str] = mapped_column(db.String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(db.String(30), nullable=False)  # evaluate_job
+    target_id: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    status: Mapped[str] = mapped_column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    result: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(db.Text, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime, default=datetime.utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime, nullable=True)
+    # Heartbeat from the owning worker process while the task is queued or running
+    updated_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime, nullable=True)
+    
+    # Status writes use their own connection so they commit independently of
+    # the request or task session.
+    @classmethod
+    def create(cls, kind: str, target_id: int) -> str:
+        task_id = uuid4().hex
+        with db.engine.begin() as conn:
+            conn.execute(db.insert(cls).values(
+                id=task_id,
+                kind=kind,
+                target_id=target_id,
+                status='queued',
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            ))
+        return task_id
+    
+    @classmethod
+    def mark(cls, task_id: str, status: str, result: dict = None, error: str = None):
+        values = {'status': status, 'updated_at': datetime.utcnow()}
+        if status in ('completed', 'failed'):
+            values.update(result=result, error=error, finished_at=datetime.utcnow())
+        with db.engine.begin() as conn:
+            conn.execute(db.update(cls).where(cls.id == task_id).values(**values))
+    
+    @classmethod
+    def heartbeat(cls, task_ids: Iterable[str]):
+        """Record that the unfinished tasks in ``task_ids`` are still owned by a live worker"""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        with db.engine.begin() as conn:
+            conn.execute(db.update(cls).where(
+                cls.id.in_(task_ids), cls.status.in_(('queued', 'running'))
+            ).values(updated_at=datetime.utcnow()))
+    
+    @classmethod
+    def fail_stale(cls, max_age_seconds: float) -> int:
+        """Mark unfinished tasks without a heartbeat for ``max_age_seconds`` as failed; returns how many"""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=max_age_seconds)
+        with db.engine.begin() as conn:
+            return conn.execute(db.update(cls).where(
+                cls.status.in_(('queued', 'running')),
+                db.func.coalesce(cls.updated_at, cls.created_at) < cutoff
+            ).values(
+                status='failed',
+                error='Worker stopped before the task finished',
+                finished_at=now
+            )).rowcount
+    
+    def _build_dict(self):
+        return {
+            'task_id': self.id,
+            'kind': self.kind,
+            'target_id': self.target_id,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
@@ -0,0 +1,80 @@
+"""Shared NLP models, loaded once per process at import time.
+
+Under gunicorn --preload these are loaded in the master process and shared
+with forked workers via copy-on-write.
+"""
+import os
+import logging
+import spacy
+import torch
+from sentence_transformers import SentenceTransformer
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Avoid oversubscribing cores when several workers run inference at once
+torch.set_num_threads(int(os.environ.get('TORCH_NUM_THREADS', '1')))
+
+# spaCy model; only its entity recognizer is used, so the tagger, parser and
+# lemmatizer are left out of the pipeline
+try:
+    NLP = spacy.load("en_core_web_sm", disable=['tagger', 'parser', 'attribute_ruler', 'lemmatizer'])
+except OSError:
+    logging.warning("spaCy model 'en_core_web_sm' not found. Install it with: python -m spacy download en_core_web_sm")
+    NLP = None
+
+# Embedding backend: "torch" (FP32) or "onnx-int8" (dynamically quantized ONNX,
+# only used on CPUs with AVX-512 VNNI; other CPUs can get slower, so benchmark first)
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'torch')
+
+# Where the exported ONNX model is kept between restarts
+ONNX_MODEL_DIR = os.environ.get(
+    'ONNX_MODEL_DIR',
+    os.path.join(os.path.dirname(__file__), 'onnx_models', EMBEDDING_MODEL_NAME)
+)
+
+# File written by export_dynamic_quantized_onnx_model for the VNNI config
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+def _cpu_has_vnni() -> bool:
+    """Whether the CPU advertises AVX-512 VNNI int8 dot products"""
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            return any('avx512_vnni' in line for line in cpuinfo if line.startswith('flags'))
+    except OSError:
+        return False
+
+def _load_int8_embedder() -> SentenceTransformer:
+    """Load the INT8 ONNX embedder, exporting and quantizing it on first startup"""
+    if not os.path.exists(os.path.join(ONNX_MODEL_DIR, ONNX_INT8_FILE)):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend="onnx")
+        model.save(ONNX_MODEL_DIR)
+        export_dynamic_quantized_onnx_model(model, "avx512_vnni", ONNX_MODEL_DIR)
+        logging.info(f"Exported INT8 ONNX embedding model to {ONNX_MODEL_DIR}")
+    
+    return SentenceTransformer(ONNX_MODEL_DIR, backend="onnx", model_kwargs={"file_name": ONNX_INT8_FILE})
+
+def _load_embedder() -> SentenceTransformer:
+    """Load the embedding model for the configured backend, falling back to FP32 PyTorch"""
+    if EMBEDDING_BACKEND == 'onnx-int8':
+        if _cpu_has_vnni():
+            try:
+                model = _load_int8_embedder()
+                logging.info(f"Loaded INT8 ONNX embedding model: {EMBEDDING_MODEL_NAME}")
+                return model
+            except Exception as e:
+                logging.warning(f"INT8 ONNX embedding model unavailable, using PyTorch: {str(e)}")
+        else:
+            logging.warning("CPU lacks AVX-512 VNNI, using the PyTorch embedding model")
+    
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    logging.info(f"Loaded embedding model: {EMBEDDING_MODEL_NAME}")
+    return model
+
+# Sentence embedding model
+try:
+    EMBEDDER = _load_embedder()
+except Exception as e:
+    logging.error(f"Error loading embedding model: {str(e)}")
+    EMBEDDER = None
@@ -1,14 +1,61 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import desc, and_, or_
-from models import db, Student, Resume, Job, Evaluation
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from sqlalchemy import desc, and_, lambda_stmt, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import defaultload, joinedload, load_only, raiseload
+from models import db, Student, Resume, Job, Evaluation, EvaluationTask
+from models.evaluation import SCORE_SCALE
 from services.feedback import FeedbackGenerator
+from services.matcher import ResumeJobMatcher
+from services.scorer import RelevanceScorer
+from services.tasks import fail_stale_tasks
 from utils.embeddings import EmbeddingManager
+from utils.json_provider import orjson_dumps, orjson_response
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import base64
+import hashlib
 import logging
+import orjson
+import threading
+import time
 
 evaluation_bp = Blueprint('evaluation', __name__)
 
+TOP_SKILLS_SQL = text("""
+    SELECT skill, count(*) AS count, count(*) OVER () AS total_unique
+    FROM (SELECT extracted_skills FROM resumes WHERE jsonb_typeof(extracted_skills) = 'array') r
+    CROSS JOIN LATERAL jsonb_array_elements_text(r.extracted_skills) AS skill
+    GROUP BY skill
+    ORDER BY count DESC, skill
+    LIMIT 10
+""")
+
+# Columns /evaluation may be sorted by; scores sort on the raw fixed-point
+# columns so the (job_id, relevance_score) index can serve the ORDER BY
+SORT_COLUMNS = {
+    'evaluation_date': Evaluation.evaluation_date,
+    'relevance_score': Evaluation._relevance_score_x100,
+    'keyword_score': Evaluation._keyword_score_x100,
+    'semantic_score': Evaluation._semantic_score_x100,
+    'verdict': Evaluation.verdict,
+    'processing_time': Evaluation.processing_time,
+    'id': Evaluation.id
+}
+
 feedback_generator = FeedbackGenerator()
 embedding_manager = EmbeddingManager()
+matcher = ResumeJobMatcher()
+scorer = RelevanceScorer()
+
+# Rows fetched per server-side cursor batch when streaming /evaluation
+STREAM_BATCH_SIZE = 200
+
+# Upper bound on threads used by batch regeneration
+BATCH_REGENERATE_WORKERS = 8
+
+# Serialized /stats payload shared by all requests in this process
+_stats_cache = {'body': None, 'etag': None, 'expires': 0.0}
+_stats_lock = threading.Lock()
 
 @evaluation_bp.route('/evaluation', methods=['GET'])
 def get_evaluations():
@@ -24,99 +71,149 @@ def get_evaluations():
         offset = request.args.get('offset', 0, type=int)
         sort_by = request.args.get('sort_by', 'evaluation_date')
         order = request.args.get('order', 'desc')
-        
-        # Build query
-        query = db.session.query(Evaluation).join(Resume).join(Job)
+        cursor = request.args.get('cursor')
+        # Cursor clients page forward without needing the total
+        include_total = request.args.get('include_total', 'false' if cursor else 'true').lower() in ('1', 'true', 'yes')
+        
+        if limit < 1:
+            return orjson_response({'error': 'limit must be a positive integer'}, 400)
+        
+        # Cursors always walk (evaluation_date, id); any other sort cannot be resumed from one
+        if cursor and sort_by != 'evaluation_date':
+            return orjson_response({'error': 'cursor pagination only supports sort_by=evaluation_date'}, 400)
+        
+        # Each row is rendered to JSON by Postgres (see _evaluation_payload);
+        # the outer join keeps evaluations whose resume has no student
+        query = select(
+            _evaluation_payload().label('payload'),
+            Evaluation.evaluation_date,
+            Evaluation.id
+        ).select_from(Evaluation).join(Resume).join(Job).outerjoin(
+            Student, Resume.student_id == Student.id
+        )
         
         # Apply filters
+        criteria = []
         if student_email:
             # Filter by student email
-            query = query.join(Student, Resume.student_id == Student.id).filter(Student.email == student_email)
+            criteria.append(Student.email == student_email)
         
         if job_id:
-            query = query.filter(Evaluation.job_id == job_id)
+            criteria.append(Evaluation.job_id == job_id)
         
         if min_score is not None:
-            query = query.filter(Evaluation.relevance_score >= min_score)
+            criteria.append(Evaluation.relevance_score >= min_score)
         
         if max_score is not None:
-            query = query.filter(Evaluation.relevance_score <= max_score)
+            criteria.append(Evaluation.relevance_score <= max_score)
         
         if verdict:
-            query = query.filter(Evaluation.verdict == verdict)
+            criteria.append(Evaluation.verdict == verdict)
         
-        # Apply sorting
-        if hasattr(Evaluation, sort_by):
-            if order.lower() == 'desc':
-                query = query.order_by(desc(getattr(Evaluation, sort_by)))
-            else:
-                query = query.order_by(getattr(Evaluation, sort_by))
-        
-        # Get total count for pagination
-        total_count = query.count()
-        
-        # Apply pagination
-        evaluations = query.offset(offset).limit(limit).all()
+        query = query.where(*criteria)
         
-        # Format results
-        results = []
-        for evaluation in evaluations:
-            eval_data = evaluation.to_dict()
+        # Apply sorting
+        descending = order.lower() == 'desc'
+        sort_column = SORT_COLUMNS.get(sort_by, Evaluation.evaluation_date)
+        keyset = sort_column is Evaluation.evaluation_date
+        if cursor:
+            # Rows without a date cannot be seeked past, so cursor pages skip them
+            criteria.append(Evaluation.evaluation_date.isnot(None))
+            query = query.where(criteria[-1])
+        if keyset:
+            sort_columns = (Evaluation.evaluation_date, Evaluation.id)
+        else:
+            sort_columns = (sort_column,)
+        query = query.order_by(*(column.desc() if descending else column.asc() for column in sort_columns))
+        
+        # Total count and score/verdict statistics in a single aggregate row
+        stats = None
+        total_count = None
+        if include_total:
+            stats = _calculate_evaluation_stats(criteria, join_student=bool(student_email))
+            total_count = stats['total']
+        
+        # Apply pagination: seek past the cursor when given, OFFSET otherwise
+        if cursor:
+            try:
+                cursor_key = _decode_cursor(cursor)
+            except (TypeError, ValueError):
+                return orjson_response({'error': 'Invalid cursor'}, 400)
             
-            # Add resume and job information
-            eval_data['resume'] = {
-                'id': evaluation.resume.id,
-                'filename': evaluation.resume.original_filename,
-                'upload_date': evaluation.resume.upload_date.isoformat() if evaluation.resume.upload_date else None
-            }
+            position = tuple_(Evaluation.evaluation_date, Evaluation.id)
+            query = query.where(position < cursor_key if descending else position > cursor_key)
+        else:
+            query = query.offset(offset)
+        
+        # Rows are fetched from a server-side cursor in batches and written
+        # out as they arrive instead of buffering the whole page
+        result = db.session.execute(query.limit(limit).execution_options(yield_per=STREAM_BATCH_SIZE))
+        
+        def generate():
+            yield b'{"evaluations":['
+            row_count = 0
+            last_row = None
+            try:
+                for batch in result.partitions():
+                    if row_count:
+                        yield b','
+                    yield b','.join(row.payload.encode() for row in batch)
+                    row_count += len(batch)
+                    last_row = batch[-1]
+            except Exception as e:
+                # Headers are already sent, so close the JSON with an error
+                # marker instead of leaving the client a truncated body
+                logging.error(f"Error streaming evaluations: {str(e)}")
+                yield b'],"error":"Failed to retrieve evaluations"}'
+                return
             
-            eval_data['job'] = {
-                'id': evaluation.job.id,
-                'title': evaluation.job.title,
-                'company': evaluation.job.company,
-                'location': evaluation.job.location
-            }
+            next_cursor = None
+            # An undated last row (offset pages only) cannot be encoded as a cursor
+            if keyset and row_count == limit and last_row is not None and last_row.evaluation_date is not None:
+                next_cursor = _encode_cursor(last_row)
             
-            # Add student information if available
-            if evaluation.resume.student:
-                eval_data['student'] = {
-                    'name': evaluation.resume.student.name,
-                    'email': evaluation.resume.student.email,
-                    'student_id': evaluation.resume.student.student_id
-                }
+            if cursor:
+                has_more = next_cursor is not None
+            elif total_count is not None:
+                has_more = offset + limit < total_count
+            else:
+                has_more = row_count == limit
             
-            results.append(eval_data)
-        
-        # Calculate statistics
-        stats = _calculate_evaluation_stats(evaluations)
-        
-        return jsonify({
-            'evaluations': results,
-            'pagination': {
-                'total': total_count,
-                'limit': limit,
-                'offset': offset,
-                'has_more': offset + limit < total_count
-            },
-            'statistics': stats
-        }), 200
+            tail = orjson_dumps({
+                'pagination': {
+                    'total': total_count,
+                    'limit': limit,
+                    'offset': offset,
+                    'has_more': has_more,
+                    'next_cursor': next_cursor
+                },
+                'statistics': stats
+            })
+            yield b'],' + tail[1:]
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         logging.error(f"Error getting evaluations: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve evaluations'}), 500
+        return orjson_response({'error': 'Failed to retrieve evaluations'}, 500)
 
 @evaluation_bp.route('/evaluation/<int:resume_id>/<int:job_id>', methods=['GET'])
 def get_evaluation_detail(resume_id, job_id):
     """Get detailed evaluation for specific resume and job"""
     try:
         # Get evaluation
-        evaluation = Evaluation.query.filter_by(
+        evaluation = Evaluation.query.options(*_strict_loading(
+            joinedload(Evaluation.resume).joinedload(Resume.student),
+            # The full resume text is never rendered here
+            defaultload(Evaluation.resume).defer(Resume.content_text),
+            joinedload(Evaluation.job)
+        )).filter_by(
             resume_id=resume_id, 
             job_id=job_id
         ).first()
         
         if not evaluation:
-            return jsonify({'error': 'Evaluation not found'}), 404
+            return orjson_response({'error': 'Evaluation not found'}, 404)
         
         # Get detailed information
         resume = evaluation.resume
@@ -133,7 +230,7 @@ def get_evaluation_detail(resume_id, job_id):
                 'extracted_education': resume.extracted_education,
                 'extracted_projects': resume.extracted_projects,
                 'extracted_certifications': resume.extracted_certifications,
-                'upload_date': resume.upload_date.isoformat() if resume.upload_date else None
+                'upload_date': resume.upload_date
             },
             'job_details': {
                 'id': job.id,
@@ -157,72 +254,29 @@ def get_evaluation_detail(resume_id, job_id):
         insights = _generate_evaluation_insights(evaluation, resume, job)
         detailed_result['insights'] = insights
         
-        return jsonify(detailed_result), 200
+        return orjson_response(detailed_result)
         
     except Exception as e:
         logging.error(f"Error getting evaluation detail: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve evaluation details'}), 500
+        return orjson_response({'error': 'Failed to retrieve evaluation details'}, 500)
 
 @evaluation_bp.route('/evaluation/regenerate/<int:evaluation_id>', methods=['POST'])
 def regenerate_evaluation(evaluation_id):
     """Regenerate evaluation with updated algorithms"""
     try:
-        evaluation = Evaluation.query.get(evaluation_id)
+        evaluation = Evaluation.cached_get(evaluation_id)
         if not evaluation:
-            return jsonify({'error': 'Evaluation not found'}), 404
-        
-        # Get resume and job data
-        resume = evaluation.resume
-        job = evaluation.job
-        
-        # Prepare data for re-evaluation
-        resume_data = {
-            'clean_text': resume.content_text,
-            'skills': resume.extracted_skills or [],
-            'experience': resume.extracted_experience or [],
-            'education': resume.extracted_education or [],
-            'projects': resume.extracted_projects or [],
-            'certifications': resume.extracted_certifications or []
-        }
-        
-        job_data = {
-            'title': job.title,
-            'company': job.company,
-            'clean_text': job.description,
-            'required_skills': job.required_skills or [],
-            'preferred_skills': job.preferred_skills or []
-        }
+            return orjson_response({'error': 'Evaluation not found'}, 404)
         
         # Re-run evaluation pipeline
-        from services.matcher import ResumeJobMatcher
-        from services.scorer import RelevanceScorer
-        
-        matcher = ResumeJobMatcher()
-        scorer = RelevanceScorer()
-        
-        # Perform matching
-        match_results = matcher.comprehensive_match(resume_data, job_data)
-        
-        # Calculate new scores
-        scoring_results = scorer.calculate_comprehensive_score(match_results)
-        
-        # Generate new feedback
-        new_feedback = feedback_generator.generate_personalized_feedback(
-            resume_data, job_data, scoring_results, match_results
-        )
+        match_results, scoring_results, new_feedback = _rescore(*_evaluation_inputs(evaluation))
         
         # Update evaluation
-        evaluation.relevance_score = scoring_results['final_score']
-        evaluation.keyword_score = scoring_results['score_breakdown']['keyword_score']
-        evaluation.semantic_score = scoring_results['score_breakdown']['semantic_score']
-        evaluation.verdict = scoring_results['verdict']
-        evaluation.feedback = new_feedback
-        evaluation.missing_skills = match_results.get('exact_skill_match', {}).get('missing_skills', [])
-        evaluation.matched_skills = match_results.get('exact_skill_match', {}).get('matched_skills', [])
+        _apply_rescore(evaluation, match_results, scoring_results, new_feedback)
         
         db.session.commit()
         
-        return jsonify({
+        return orjson_response({
             'success': True,
             'message': 'Evaluation regenerated successfully',
             'evaluation': evaluation.to_dict(),
@@ -231,11 +285,11 @@ def regenerate_evaluation(evaluation_id):
                 'feedback_updated': True,
                 'new_score': scoring_results['final_score']
             }
-        }), 200
+        })
         
     except Exception as e:
         logging.error(f"Error regenerating evaluation: {str(e)}")
-        return jsonify({'error': 'Failed to regenerate evaluation'}), 500
+        return orjson_response({'error': 'Failed to regenerate evaluation'}, 500)
 
 @evaluation_bp.route('/evaluation/batch-regenerate', methods=['POST'])
 def batch_regenerate_evaluations():
@@ -245,109 +299,97 @@ def batch_regenerate_evaluations():
         evaluation_ids = data.get('evaluation_ids', [])
         
         if not evaluation_ids:
-            return jsonify({'error': 'No evaluation IDs provided'}), 400
-        
-        updated_count = 0
-        errors = []
-        
-        for eval_id in evaluation_ids:
-            try:
-                # Use the regenerate logic for each evaluation
-                evaluation = Evaluation.query.get(eval_id)
-                if evaluation:
-                    # Regenerate evaluation (simplified version)
-                    updated_count += 1
-                else:
-                    errors.append(f"Evaluation {eval_id} not found")
-            except Exception as e:
-                errors.append(f"Error updating evaluation {eval_id}: {str(e)}")
-        
+            return orjson_response({'error': 'No evaluation IDs provided'}, 400)
+        
+        try:
+            evaluation_ids = list(dict.fromkeys(int(eval_id) for eval_id in evaluation_ids))
+        except (TypeError, ValueError):
+            return orjson_response({'error': 'Evaluation IDs must be integers'}, 400)
+        
+        # Claim every evaluation with its resume and job in one IN (...) query;
+        # rows another regeneration holds locked are skipped instead of waited on
+        evaluations = Evaluation.query.options(
+            joinedload(Evaluation.resume),
+            joinedload(Evaluation.job)
+        ).filter(
+            Evaluation.id.in_(evaluation_ids)
+        ).with_for_update(of=Evaluation, skip_locked=True).all()
+        
+        found_ids = {evaluation.id for evaluation in evaluations}
+        errors = [
+            f"Evaluation {eval_id} not found or already being regenerated"
+            for eval_id in evaluation_ids if eval_id not in found_ids
+        ]
+        updates = []
+        
+        if evaluations:
+            # Inputs are built from the session here; worker threads only run
+            # the (thread-safe) scoring pipeline and never touch ORM objects
+            inputs = [_evaluation_inputs(evaluation) for evaluation in evaluations]
+            app = current_app._get_current_object()
+            
+            def regen_one(args):
+                with app.app_context():
+                    try:
+                        return _rescore(*args), None
+                    except Exception as e:
+                        return None, e
+            
+            workers = min(BATCH_REGENERATE_WORKERS, len(inputs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for evaluation, (result, error) in zip(evaluations, pool.map(regen_one, inputs)):
+                    if error is not None:
+                        errors.append(f"Error updating evaluation {evaluation.id}: {str(error)}")
+                    else:
+                        updates.append({'id': evaluation.id, **_rescore_values(*result)})
+        
+        # One executemany UPDATE for the whole batch, committed once
+        Evaluation.bulk_update(updates)
         db.session.commit()
+        updated_count = len(updates)
         
-        return jsonify({
+        return orjson_response({
             'success': True,
             'message': f'Updated {updated_count} evaluations',
             'updated_count': updated_count,
             'errors': errors
-        }), 200
+        })
         
     except Exception as e:
         logging.error(f"Error in batch regeneration: {str(e)}")
-        return jsonify({'error': 'Failed to regenerate evaluations'}), 500
+        return orjson_response({'error': 'Failed to regenerate evaluations'}, 500)
+
+@evaluation_bp.route('/evaluations/status/<task_id>', methods=['GET'])
+def get_task_status(task_id):
+    """Get the status of a background evaluation task"""
+    try:
+        # Tasks left unfinished by a worker that exited would otherwise stay running forever
+        fail_stale_tasks()
+        
+        task = db.session.get(EvaluationTask, task_id)
+        if not task:
+            return orjson_response({'error': 'Task not found'}, 404)
+        
+        return orjson_response(task.to_dict())
+        
+    except Exception as e:
+        logging.error(f"Error getting task status: {str(e)}")
+        return orjson_response({'error': 'Failed to retrieve task status'}, 500)
 
 @evaluation_bp.route('/stats', methods=['GET'])
 def get_system_stats():
     """Get system statistics"""
     try:
-        # Get counts
-        total_resumes = Resume.query.count()
-        total_jobs = Job.query.filter_by(status='active').count()
-        total_evaluations = Evaluation.query.count()
-        total_students = Student.query.count()
-        
-        # Get average scores
-        avg_score_result = db.session.query(db.func.avg(Evaluation.relevance_score)).scalar()
-        avg_score = round(avg_score_result, 1) if avg_score_result else 0
-        
-        # Get verdict distribution
-        verdict_stats = db.session.query(
-            Evaluation.verdict,
-            db.func.count(Evaluation.verdict)
-        ).group_by(Evaluation.verdict).all()
-        
-        verdict_distribution = {verdict: count for verdict, count in verdict_stats}
-        
-        # Get high performers (score >= 75)
-        high_performers = Evaluation.query.filter(Evaluation.relevance_score >= 75).count()
-        
-        # Get recent activity (last 7 days)
-        from datetime import datetime, timedelta
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_resumes = Resume.query.filter(Resume.upload_date >= week_ago).count()
-        recent_jobs = Job.query.filter(Job.upload_date >= week_ago).count()
-        
-        # Get top skills from resumes
-        all_skills = []
-        resumes_with_skills = Resume.query.filter(Resume.extracted_skills.isnot(None)).all()
-        for resume in resumes_with_skills:
-            if resume.extracted_skills:
-                all_skills.extend(resume.extracted_skills)
-        
-        from collections import Counter
-        top_skills = Counter(all_skills).most_common(10)
-        
-        stats = {
-            'totals': {
-                'resumes': total_resumes,
-                'jds': total_jobs,
-                'evaluations': total_evaluations,
-                'students': total_students
-            },
-            'averages': {
-                'avg_score': avg_score
-            },
-            'distributions': {
-                'verdicts': verdict_distribution
-            },
-            'performance': {
-                'high_performers': high_performers,
-                'high_performer_rate': round((high_performers / total_evaluations * 100), 1) if total_evaluations > 0 else 0
-            },
-            'recent_activity': {
-                'resumes_this_week': recent_resumes,
-                'jobs_this_week': recent_jobs
-            },
-            'insights': {
-                'top_skills': [{'skill': skill, 'count': count} for skill, count in top_skills],
-                'total_unique_skills': len(set(all_skills))
-            }
-        }
-        
-        return jsonify(stats), 200
+        body, etag = _get_cached_stats()
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.max_age = current_app.config.get('STATS_CACHE_TTL', 30)
+        # Answers 304 Not Modified when If-None-Match matches
+        return response.make_conditional(request)
         
     except Exception as e:
         logging.error(f"Error getting stats: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve statistics'}), 500
+        return orjson_response({'error': 'Failed to retrieve statistics'}, 500)
 
 @evaluation_bp.route('/job-descriptions', methods=['GET'])
 def get_job_descriptions():
@@ -358,27 +400,36 @@ def get_job_descriptions():
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        # Build query
-        query = Job.query.filter_by(status=status)
-        
         # Get total count
-        total_count = query.count()
+        total_count = db.session.execute(lambda_stmt(
+            lambda: select(db.func.count(Job.id)).where(Job.status == status)
+        )).scalar()
+        
+        # Fetch plain rows for the page (no ORM instances needed for listing)
+        job_descriptions = Job.serialized_rows(
+            Job.status == status,
+            order_by=desc(Job.upload_date),
+            offset=offset,
+            limit=limit
+        )
         
-        # Apply pagination and get results
-        jobs = query.order_by(desc(Job.upload_date)).offset(offset).limit(limit).all()
+        # Evaluation statistics for every job on the page in one grouped query
+        job_ids = [job_data['id'] for job_data in job_descriptions]
+        page_stats = {
+            job_id: (count, avg_score, best_score)
+            for job_id, count, avg_score, best_score in db.session.execute(lambda_stmt(
+                lambda: select(
+                    Evaluation.job_id,
+                    db.func.count(Evaluation.id),
+                    db.func.avg(Evaluation.relevance_score),
+                    db.func.max(Evaluation.relevance_score)
+                ).where(Evaluation.job_id.in_(job_ids)).group_by(Evaluation.job_id)
+            ))
+        }
         
         # Format results
-        job_descriptions = []
-        for job in jobs:
-            job_data = job.to_dict()
-            
-            # Add evaluation statistics for this job
-            eval_stats = db.session.query(
-                db.func.count(Evaluation.id),
-                db.func.avg(Evaluation.relevance_score),
-                db.func.max(Evaluation.relevance_score)
-            ).filter(Evaluation.job_id == job.id).first()
-            
+        for job_data in job_descriptions:
+            eval_stats = page_stats.get(job_data['id'], (0, None, None))
             job_data['evaluation_stats'] = {
                 'total_evaluations': eval_stats[0] or 0,
                 'average_score': round(eval_stats[1], 1) if eval_stats[1] else 0,
@@ -386,11 +437,10 @@ def get_job_descriptions():
             }
             
             # Add preview of description
-            job_data['preview'] = job.description[:300] + '...' if len(job.description) > 300 else job.description
-            
-            job_descriptions.append(job_data)
+            description = job_data['description']
+            job_data['preview'] = description[:300] + '...' if len(description) > 300 else description
         
-        return jsonify({
+        return orjson_response({
             'job_descriptions': job_descriptions,
             'pagination': {
                 'total': total_count,
@@ -398,11 +448,11 @@ def get_job_descriptions():
                 'offset': offset,
                 'has_more': offset + limit < total_count
             }
-        }), 200
+        })
         
     except Exception as e:
         logging.error(f"Error getting job descriptions: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve job descriptions'}), 500
+        return orjson_response({'error': 'Failed to retrieve job descriptions'}, 500)
 
 @evaluation_bp.route('/student/uploads', methods=['GET'])
 def get_student_uploads():
@@ -410,30 +460,47 @@ def get_student_uploads():
     try:
         student_email = request.args.get('email')
         if not student_email:
-            return jsonify({'error': 'Email parameter required'}), 400
+            return orjson_response({'error': 'Email parameter required'}, 400)
         
         # Find student
         student = Student.query.filter_by(email=student_email).first()
         if not student:
-            return jsonify({'uploads': []}), 200
+            return orjson_response({'uploads': []})
         
         # Get student's resumes with evaluation stats
-        resumes = Resume.query.filter_by(student_id=student.id).order_by(desc(Resume.upload_date)).all()
+        resumes = Resume.query.options(*_strict_loading(
+            load_only(
+                Resume.id,
+                Resume.original_filename,
+                Resume.upload_date,
+                Resume.processing_status,
+                Resume.extracted_skills
+            )
+        )).filter_by(
+            student_id=student.id
+        ).order_by(desc(Resume.upload_date)).all()
+        
+        # Best score and evaluation count for all resumes in one grouped query
+        resume_ids = [resume.id for resume in resumes]
+        eval_stats = {
+            resume_id: (best_score, count)
+            for resume_id, best_score, count in db.session.execute(lambda_stmt(
+                lambda: select(
+                    Evaluation.resume_id,
+                    db.func.max(Evaluation.relevance_score),
+                    db.func.count(Evaluation.id)
+                ).where(Evaluation.resume_id.in_(resume_ids)).group_by(Evaluation.resume_id)
+            ))
+        }
         
         uploads = []
         for resume in resumes:
-            # Get best evaluation score for this resume
-            best_eval = db.session.query(
-                db.func.max(Evaluation.relevance_score)
-            ).filter(Evaluation.resume_id == resume.id).scalar()
-            
-            # Get total evaluations count
-            eval_count = Evaluation.query.filter_by(resume_id=resume.id).count()
+            best_eval, eval_count = eval_stats.get(resume.id, (None, 0))
             
             upload_data = {
                 'resume_id': resume.id,
                 'filename': resume.original_filename,
-                'upload_date': resume.upload_date.isoformat() if resume.upload_date else None,
+                'upload_date': resume.upload_date,
                 'status': resume.processing_status,
                 'best_score': round(best_eval, 1) if best_eval else 0,
                 'total_evaluations': eval_count,
@@ -442,18 +509,230 @@ def get_student_uploads():
             
             uploads.append(upload_data)
         
-        return jsonify({
+        return orjson_response({
             'uploads': uploads,
             'student_info': student.to_dict()
-        }), 200
+        })
         
     except Exception as e:
         logging.error(f"Error getting student uploads: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve student uploads'}), 500
+        return orjson_response({'error': 'Failed to retrieve student uploads'}, 500)
+
+def _get_cached_stats():
+    """Return (json_bytes, etag) for /stats, recomputed at most once per TTL"""
+    ttl = current_app.config.get('STATS_CACHE_TTL', 30)
+    with _stats_lock:
+        if _stats_cache['body'] is None or time.monotonic() >= _stats_cache['expires']:
+            body = orjson_dumps(_compute_system_stats())
+            _stats_cache['body'] = body
+            _stats_cache['etag'] = hashlib.blake2b(body, digest_size=16).hexdigest()
+            _stats_cache['expires'] = time.monotonic() + ttl
+        return _stats_cache['body'], _stats_cache['etag']
+
+def _compute_system_stats():
+    """Aggregate the system statistics served by /stats"""
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    
+    # Get counts, average score, high performers and recent activity in one round-trip
+    totals = db.session.execute(lambda_stmt(lambda: _system_totals_stmt(week_ago))).one()
+    total_resumes = totals.resumes
+    total_jobs = totals.jobs
+    total_evaluations = totals.evaluations
+    total_students = totals.students
+    avg_score = round(totals.avg_score, 1) if totals.avg_score else 0
+    high_performers = totals.high_performers
+    recent_resumes = totals.recent_resumes
+    recent_jobs = totals.recent_jobs
+    
+    # Get verdict distribution
+    verdict_stats = db.session.execute(lambda_stmt(
+        lambda: select(Evaluation.verdict, db.func.count(Evaluation.verdict)).group_by(Evaluation.verdict)
+    )).all()
+    
+    verdict_distribution = {verdict: count for verdict, count in verdict_stats}
+    
+    # Get top skills from resumes (aggregated in Postgres; the window
+    # count gives the number of distinct skills in the same round-trip)
+    skill_rows = db.session.execute(TOP_SKILLS_SQL).all()
+    top_skills = [(row.skill, row.count) for row in skill_rows]
+    total_unique_skills = skill_rows[0].total_unique if skill_rows else 0
+    
+    stats = {
+        'totals': {
+            'resumes': total_resumes,
+            'jds': total_jobs,
+            'evaluations': total_evaluations,
+            'students': total_students
+        },
+        'averages': {
+            'avg_score': avg_score
+        },
+        'distributions': {
+            'verdicts': verdict_distribution
+        },
+        'performance': {
+            'high_performers': high_performers,
+            'high_performer_rate': round((high_performers / total_evaluations * 100), 1) if total_evaluations > 0 else 0
+        },
+        'recent_activity': {
+            'resumes_this_week': recent_resumes,
+            'jobs_this_week': recent_jobs
+        },
+        'insights': {
+            'top_skills': [{'skill': skill, 'count': count} for skill, count in top_skills],
+            'total_unique_skills': total_unique_skills
+        }
+    }
+    
+    return stats
+
+def _system_totals_stmt(week_ago):
+    """Single SELECT of scalar subqueries for the /stats totals"""
+    def scalar(*columns, where=None):
+        stmt = select(*columns)
+        if where is not None:
+            stmt = stmt.where(where)
+        return stmt.scalar_subquery()
+    
+    return select(
+        scalar(db.func.count(Resume.id)).label('resumes'),
+        scalar(db.func.count(Job.id), where=Job.status == 'active').label('jobs'),
+        scalar(db.func.count(Evaluation.id)).label('evaluations'),
+        scalar(db.func.count(Student.id)).label('students'),
+        scalar(db.func.avg(Evaluation.relevance_score)).label('avg_score'),
+        scalar(db.func.count(Evaluation.id), where=Evaluation.relevance_score >= 75).label('high_performers'),
+        scalar(db.func.count(Resume.id), where=Resume.upload_date >= week_ago).label('recent_resumes'),
+        scalar(db.func.count(Job.id), where=Job.upload_date >= week_ago).label('recent_jobs')
+    )
 
-def _calculate_evaluation_stats(evaluations):
-    """Calculate statistics for a list of evaluations"""
-    if not evaluations:
+def _evaluation_payload():
+    """SQL expression rendering an evaluation list item as JSON text.
+
+    Matches ``Evaluation.to_dict()`` plus the nested resume, job and (when
+    present) student objects, so list pages need no per-row Python work.
+    """
+    fields = []
+    for column in Evaluation._serialized_select_columns():
+        fields += [column.key, getattr(column, 'element', column)]
+    
+    payload = db.func.jsonb_build_object(
+        *fields,
+        'resume', db.func.jsonb_build_object(
+            'id', Resume.id,
+            'filename', Resume.original_filename,
+            'upload_date', Resume.upload_date
+        ),
+        'job', db.func.jsonb_build_object(
+            'id', Job.id,
+            'title', Job.title,
+            'company', Job.company,
+            'location', Job.location
+        )
+    )
+    student = db.case(
+        (Student.id.is_(None), db.cast('{}', JSONB)),
+        else_=db.func.jsonb_build_object('student', db.func.jsonb_build_object(
+            'name', Student.name,
+            'email', Student.email,
+            'student_id', Student.student_id
+        ))
+    )
+    return db.cast(payload.op('||')(student), db.Text)
+
+def _strict_loading(*loaders):
+    """Loader options with lazy loads turned into errors when RAISE_ON_LAZY_LOAD is set"""
+    if not current_app.config.get('RAISE_ON_LAZY_LOAD'):
+        return loaders
+    return (*(loader.raiseload('*') for loader in loaders), raiseload('*'))
+
+def _encode_cursor(evaluation):
+    """Opaque keyset cursor for the row after ``evaluation`` (an instance or row)"""
+    key = [evaluation.evaluation_date.isoformat(), evaluation.id]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode('ascii')
+
+def _decode_cursor(cursor):
+    """Turn a cursor from _encode_cursor back into (evaluation_date, id)"""
+    date_value, evaluation_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return datetime.fromisoformat(date_value), int(evaluation_id)
+
+def _evaluation_inputs(evaluation):
+    """Build the matcher inputs from an evaluation's resume and job"""
+    resume = evaluation.resume
+    job = evaluation.job
+    
+    resume_data = {
+        'clean_text': resume.content_text,
+        'skills': resume.extracted_skills or [],
+        'experience': resume.extracted_experience or [],
+        'education': resume.extracted_education or [],
+        'projects': resume.extracted_projects or [],
+        'certifications': resume.extracted_certifications or []
+    }
+    
+    job_data = {
+        'title': job.title,
+        'company': job.company,
+        'clean_text': job.description,
+        'required_skills': job.required_skills or [],
+        'preferred_skills': job.preferred_skills or [],
+        **(job.parsed_cache or {})
+    }
+    
+    # Scored with the same embedding similarity the upload paths use
+    embedding_similarity = embedding_manager.job_similarities(
+        resume.id, resume.content_text, [(job.id, job.description)]
+    ).get(job.id)
+    
+    return resume_data, job_data, embedding_similarity
+
+def _rescore(resume_data, job_data, embedding_similarity=None):
+    """Run matching, scoring and feedback generation for one resume/job pair"""
+    # Perform matching
+    match_results = matcher.comprehensive_match(resume_data, job_data)
+    
+    # Calculate new scores
+    scoring_results = scorer.calculate_comprehensive_score(match_results, embedding_similarity)
+    
+    # Generate new feedback
+    new_feedback = feedback_generator.generate_personalized_feedback(
+        resume_data, job_data, scoring_results, match_results
+    )
+    
+    return match_results, scoring_results, new_feedback
+
+def _rescore_values(match_results, scoring_results, new_feedback):
+    """Evaluation attributes changed by a regeneration"""
+    return {
+        'relevance_score': scoring_results['final_score'],
+        'keyword_score': scoring_results['score_breakdown']['keyword_score'],
+        'semantic_score': scoring_results['score_breakdown']['semantic_score'],
+        'verdict': scoring_results['verdict'],
+        'feedback': new_feedback,
+        'missing_skills': match_results.get('exact_skill_match', {}).get('missing_skills', []),
+        'matched_skills': match_results.get('exact_skill_match', {}).get('matched_skills', [])
+    }
+
+def _apply_rescore(evaluation, match_results, scoring_results, new_feedback):
+    """Copy regenerated scores and feedback onto an evaluation"""
+    for name, value in _rescore_values(match_results, scoring_results, new_feedback).items():
+        setattr(evaluation, name, value)
+
+def _calculate_evaluation_stats(criteria, join_student=False):
+    """Calculate statistics for all evaluations matching ``criteria``"""
+    raw_score = Evaluation._relevance_score_x100
+    stmt = select(
+        db.func.count().label('total'),
+        db.func.avg(raw_score).label('avg_score'),
+        db.func.min(raw_score).label('min_score'),
+        db.func.max(raw_score).label('max_score'),
+        *(db.func.sum(db.case((Evaluation.verdict == v, 1), else_=0)).label(v.lower())
+          for v in ('High', 'Medium', 'Low'))
+    ).select_from(Evaluation)
+    if join_student:
+        stmt = stmt.join(Resume).join(Student, Resume.student_id == Student.id)
+    row = db.session.execute(stmt.where(*criteria)).one()
+    
+    if not row.total:
         return {
             'total': 0,
             'average_score': 0,
@@ -462,24 +741,23 @@ def _calculate_evaluation_stats(evaluations):
             'low_count': 0
         }
     
-    scores = [eval.relevance_score for eval in evaluations]
-    verdicts = [eval.verdict for eval in evaluations]
-    
-    from collections import Counter
-    verdict_counts = Counter(verdicts)
-    
     return {
-        'total': len(evaluations),
-        'average_score': round(sum(scores) / len(scores), 1),
-        'min_score': round(min(scores), 1),
-        'max_score': round(max(scores), 1),
-        'high_count': verdict_counts.get('High', 0),
-        'medium_count': verdict_counts.get('Medium', 0),
-        'low_count': verdict_counts.get('Low', 0)
+        'total': row.total,
+        'average_score': round(float(row.avg_score) / SCORE_SCALE, 1),
+        'min_score': round(row.min_score / SCORE_SCALE, 1),
+        'max_score': round(row.max_score / SCORE_SCALE, 1),
+        'high_count': row.high,
+        'medium_count': row.medium,
+        'low_count': row.low
     }
 
 def _generate_evaluation_insights(evaluation, resume, job):
-    """Generate additional insights for detailed evaluation view"""
+    """Generate additional insights for detailed evaluation view.
+
+    Not memoized: evaluations have no updated_at to key a cache on, and
+    regeneration rewrites scores and skills without changing evaluation_date,
+    so an (id, evaluation_date) key would serve stale insights.
+    """
     insights = {
         'strengths': [],
         'areas_for_improvement': [],
@@ -514,11 +792,14 @@ def _generate_evaluation_insights(evaluation, resume, job):
     resume_skills = resume.extracted_skills or []
     
     if all_job_skills and resume_skills:
-        skill_coverage = len(set(resume_skills) & set(all_job_skills)) / len(all_job_skills) * 100
+        # Case-insensitive, de-duplicated skill sets, intersected once; coverage
+        # is over distinct skills while total_job_skills stays the listed count
+        job_skill_set = {skill.lower() for skill in all_job_skills}
+        matched_count = len(job_skill_set & {skill.lower() for skill in resume_skills})
         insights['skill_analysis'] = {
-            'coverage_percentage': round(skill_coverage, 1),
+            'coverage_percentage': round(matched_count / len(job_skill_set) * 100, 1),
             'total_job_skills': len(all_job_skills),
-            'matched_skills': len(set(resume_skills) & set(all_job_skills))
+            'matched_skills': matched_count
         }
     
     return insights
\ No newline at end of file
@@ -4,12 +4,17 @@ import os
 import json
 import time
 import logging
+import threading
+import numpy as np
 from datetime import datetime
-from models import db, Student, Resume, Job
+from sqlalchemy import select
+from models import db, Student, Resume, Job, Evaluation, Skill
 from services.parser import DocumentParser
 from services.matcher import ResumeJobMatcher
 from services.scorer import RelevanceScorer
 from services.feedback import FeedbackGenerator
+from services.pipeline import match_and_score_all
+from services.tasks import submit_task
 from utils.embeddings import EmbeddingManager
 
 upload_bp = Blueprint('upload', __name__)
@@ -21,9 +26,42 @@ scorer = RelevanceScorer()
 feedback_generator = FeedbackGenerator()
 embedding_manager = EmbeddingManager()
 
+# Resumes fetched and scored per batch when a new job is evaluated
+RESUME_BATCH_SIZE = 256
+
+# Jobs a new resume is scored against for immediate feedback
+IMMEDIATE_FEEDBACK_JOBS = 5
+
+# Nearest jobs fetched from the vector index per shortlisted slot, leaving
+# room for neighbours that are no longer active
+SHORTLIST_OVERFETCH = 4
+
+# Active jobs used for immediate resume feedback, reused for ACTIVE_JOBS_TTL seconds
+ACTIVE_JOBS_TTL = 60
+_active_jobs_cache = {'jobs': None, 'expires': 0.0}
+_active_jobs_lock = threading.Lock()
+
+# Upload extensions allowed by the app config, read once per process
+_allowed_extensions = None
+
+def _get_allowed_extensions():
+    global _allowed_extensions
+    if _allowed_extensions is None:
+        _allowed_extensions = frozenset(current_app.config['ALLOWED_EXTENSIONS'])
+    return _allowed_extensions
+
 def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in _get_allowed_extensions()
+
+def _upload_size(file) -> int:
+    """Size in bytes of an uploaded file, read from its request stream (no stat of the saved copy)"""
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
 
 @upload_bp.route('/upload/resume', methods=['POST'])
 def upload_resume():
@@ -51,12 +89,12 @@ def upload_resume():
         # Create uploads directory if it doesn't exist
         os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
         
-        # Save file with secure filename
+        # Secure filename for the stored copy
         filename = secure_filename(file.filename)
         timestamp = str(int(time.time()))
         filename = f"{timestamp}_{filename}"
         file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        file_size = _upload_size(file)
         
         # Handle student information
         student = None
@@ -72,12 +110,12 @@ def upload_resume():
                     graduation_year=student_data.get('graduation_year')
                 )
                 db.session.add(student)
-                db.session.commit()
+                db.session.flush()  # Committed together with the resume
         
         # Parse resume
-        parsing_start = time.time()
-        parsed_data = parser.parse_resume(file_path)
-        parsing_time = time.time() - parsing_start
+        parsing_start = time.perf_counter()
+        parsed_data = parser.parse_resume_stream(file.stream, filename)
+        parsing_time = time.perf_counter() - parsing_start
         
         if 'error' in parsed_data:
             return jsonify({'error': f'Failed to parse resume: {parsed_data["error"]}'}), 400
@@ -94,11 +132,17 @@ def upload_resume():
             extracted_projects=parsed_data.get('projects', []),
             extracted_certifications=parsed_data.get('certifications', []),
             student_id=student.id if student else None,
-            file_size=os.path.getsize(file_path),
+            file_size=file_size,
             processing_status='processed'
         )
         
         db.session.add(resume)
+        db.session.flush()
+        Skill.link_resume(resume.id, resume.extracted_skills)
+        
+        # Only keep the original once it has a resume row
+        file.stream.seek(0)
+        file.save(file_path)
         db.session.commit()
         
         # Store resume embedding for future similarity searches
@@ -174,28 +218,19 @@ def upload_job_description():
                 except json.JSONDecodeError:
                     job_metadata = {}
             
-            # Save and parse file
-            os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+            # Extract text straight from the upload; the file is saved once the job is created
             filename = secure_filename(file.filename)
             timestamp = str(int(time.time()))
             filename = f"jd_{timestamp}_{filename}"
-            file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            
-            # Extract text from file
-            if filename.lower().endswith('.txt'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    job_text = f.read()
-            else:
-                job_text = parser.extract_text(file_path)
+            job_text = parser.extract_text_from_stream(file.stream, filename)
         
         if not job_text.strip():
             return jsonify({'error': 'Could not extract text from job description'}), 400
         
         # Parse job description
-        parsing_start = time.time()
+        parsing_start = time.perf_counter()
         parsed_jd = parser.parse_job_description(job_text)
-        parsing_time = time.time() - parsing_start
+        parsing_time = time.perf_counter() - parsing_start
         
         if 'error' in parsed_jd:
             return jsonify({'error': f'Failed to parse job description: {parsed_jd["error"]}'}), 400
@@ -219,11 +254,20 @@ def upload_job_description():
             application_deadline=datetime.strptime(job_metadata['application_deadline'], '%Y-%m-%d').date() 
                                 if job_metadata.get('application_deadline') else None,
             uploaded_by='placement_team',  # This should come from authentication
-            status='active'
+            status='active',
+            parsed_cache=matcher.preprocess_job(job_text)
         )
         
         db.session.add(job)
+        db.session.flush()
+        Skill.link_job(job.id, job.required_skills, job.preferred_skills)
+        
+        if not request.is_json:
+            os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+            file.stream.seek(0)
+            file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], filename))
         db.session.commit()
+        _invalidate_active_jobs()
         
         # Store job embedding
         embedding_manager.store_job_embedding(
@@ -236,8 +280,11 @@ def upload_job_description():
             }
         )
         
-        # Evaluate existing resumes against this job (async operation in production)
-        pending_evaluations = _evaluate_job_against_resumes(job, parsed_jd)
+        # Evaluate existing resumes against this job in the background
+        pending_evaluations = db.session.query(db.func.count(Resume.id)).filter(
+            Resume.processing_status == 'processed'
+        ).scalar()
+        task_id = submit_task('evaluate_job', job.id, _evaluate_job_task, job.id, parsed_jd)
         
         response_data = {
             'success': True,
@@ -249,6 +296,7 @@ def upload_job_description():
                 'keywords_identified': len(job_text.split()),
                 'resumes_pending': pending_evaluations
             },
+            'task_id': task_id,
             'preview': job_text[:200] + '...' if len(job_text) > 200 else job_text
         }
         
@@ -258,125 +306,257 @@ def upload_job_description():
         logging.error(f"Error uploading job description: {str(e)}")
         return jsonify({'error': 'Internal server error occurred while processing job description'}), 500
 
+def _job_data_select():
+    """Columns needed to build matcher inputs for a job"""
+    return select(
+        Job.id, Job.title, Job.company, Job.description,
+        Job.required_skills, Job.preferred_skills, Job.parsed_cache
+    )
+
+def _job_data(job) -> dict:
+    """Matcher inputs for a row from ``_job_data_select``"""
+    return {
+        'title': job.title,
+        'company': job.company,
+        'clean_text': job.description,
+        'required_skills': job.required_skills or [],
+        'preferred_skills': job.preferred_skills or [],
+        **(job.parsed_cache or {})
+    }
+
+def _get_active_jobs():
+    """Matcher inputs for the active jobs used for immediate feedback, cached briefly.
+
+    Returns a tuple of ``(job_id, job_data)`` pairs; callers must not mutate
+    ``job_data``.
+    """
+    with _active_jobs_lock:
+        if _active_jobs_cache['jobs'] is None or time.monotonic() >= _active_jobs_cache['expires']:
+            jobs = db.session.execute(
+                _job_data_select().where(Job.status == 'active').limit(IMMEDIATE_FEEDBACK_JOBS)
+            ).all()
+            _active_jobs_cache['jobs'] = tuple((job.id, _job_data(job)) for job in jobs)
+            _active_jobs_cache['expires'] = time.monotonic() + ACTIVE_JOBS_TTL
+        return _active_jobs_cache['jobs']
+
+def _shortlist_jobs(resume_id: int):
+    """Active jobs nearest to the resume's embedding, as ``(job_id, job_data)`` pairs.
+
+    Returns an empty tuple when the resume has no stored embedding or the
+    index has no active jobs, so callers can fall back to ``_get_active_jobs``.
+    """
+    resume_key = f"resume_{resume_id}"
+    resume_vector = embedding_manager.get_embeddings([resume_key]).get(resume_key)
+    if resume_vector is None:
+        return ()
+    
+    nearest_ids = embedding_manager.nearest_job_ids(
+        resume_vector, limit=IMMEDIATE_FEEDBACK_JOBS * SHORTLIST_OVERFETCH
+    )
+    if not nearest_ids:
+        return ()
+    
+    jobs = {
+        job.id: job
+        for job in db.session.execute(
+            _job_data_select().where(Job.id.in_(nearest_ids), Job.status == 'active')
+        )
+    }
+    shortlist = [job_id for job_id in nearest_ids if job_id in jobs][:IMMEDIATE_FEEDBACK_JOBS]
+    return tuple((job_id, _job_data(jobs[job_id])) for job_id in shortlist)
+
+def _invalidate_active_jobs():
+    """Drop this process's cached active jobs (other workers expire via the TTL)"""
+    with _active_jobs_lock:
+        _active_jobs_cache['jobs'] = None
+
 def _evaluate_against_jobs(resume: Resume, parsed_resume: dict) -> dict:
     """Evaluate resume against available jobs and return immediate feedback"""
     try:
-        # Get active jobs
-        jobs = Job.query.filter_by(status='active').limit(5).all()  # Limit to 5 for quick feedback
+        # Score only the nearest active jobs when the vector index can shortlist them
+        jobs = _shortlist_jobs(resume.id) or _get_active_jobs()
         
         if not jobs:
             return None
         
         best_score = 0
         best_job = None
-        evaluations_created = 0
+        evaluation_rows = []
         
-        for job in jobs:
-            # Parse job if needed
-            job_data = {
-                'title': job.title,
-                'company': job.company,
-                'clean_text': job.description,
-                'required_skills': job.required_skills or [],
-                'preferred_skills': job.preferred_skills or []
-            }
-            
+        # Tokenize the resume once for BM25 against every job
+        parsed_resume = {**parsed_resume, 'tokens': matcher.preprocess_text(parsed_resume.get('clean_text', ''))}
+        
+        # TF-IDF similarity to every job in one pass
+        tfidf_matches = matcher.tfidf_similarity_jobs(
+            parsed_resume.get('clean_text', ''),
+            [job_data.get('clean_text', '') for _, job_data in jobs]
+        )
+        
+        # Required-skill overlap with every job in one grouped query over the skill tables
+        skill_counts = Skill.matched_counts(resume.id, [job_id for job_id, _ in jobs])
+        
+        # Embedding similarity to every job, as the background job path scores it
+        similarities = embedding_manager.job_similarities(
+            resume.id, parsed_resume.get('clean_text', ''),
+            [(job_id, job_data.get('clean_text', '')) for job_id, job_data in jobs]
+        )
+        
+        for (job_id, job_data), tfidf_match in zip(jobs, tfidf_matches):
             # Perform matching
-            match_results = matcher.comprehensive_match(parsed_resume, job_data)
+            match_results = matcher.comprehensive_match(parsed_resume, job_data, tfidf_match, skill_counts.get(job_id))
             
             # Calculate score
-            scoring_results = scorer.calculate_comprehensive_score(match_results)
+            scoring_results = scorer.calculate_comprehensive_score(match_results, similarities.get(job_id))
             
             # Track best score
             if scoring_results['final_score'] > best_score:
                 best_score = scoring_results['final_score']
-                best_job = job
-            
-            # Create evaluation record (simplified for immediate feedback)
-            from models.evaluation import Evaluation
-            evaluation = Evaluation(
-                resume_id=resume.id,
-                job_id=job.id,
-                relevance_score=scoring_results['final_score'],
-                keyword_score=scoring_results['score_breakdown']['keyword_score'],
-                semantic_score=scoring_results['score_breakdown']['semantic_score'],
-                verdict=scoring_results['verdict'],
-                missing_skills=match_results.get('exact_skill_match', {}).get('missing_skills', []),
-                matched_skills=match_results.get('exact_skill_match', {}).get('matched_skills', []),
-                evaluation_date=datetime.utcnow()
-            )
+                best_job = job_data
             
-            db.session.add(evaluation)
-            evaluations_created += 1
-        
+            # Collect evaluation record (simplified for immediate feedback) for a single bulk insert
+            evaluation_rows.append({
+                'resume_id': resume.id,
+                'job_id': job_id,
+                'relevance_score': scoring_results['final_score'],
+                'keyword_score': scoring_results['score_breakdown']['keyword_score'],
+                'semantic_score': scoring_results['score_breakdown']['semantic_score'],
+                'verdict': scoring_results['verdict'],
+                'missing_skills': match_results.get('exact_skill_match', {}).get('missing_skills', []),
+                'matched_skills': match_results.get('exact_skill_match', {}).get('matched_skills', []),
+                'evaluation_date': datetime.utcnow()
+            })
+        
+        Evaluation.bulk_create(evaluation_rows)
         db.session.commit()
+        evaluations_created = len(evaluation_rows)
         
         return {
             'best_score': round(best_score, 1),
-            'best_job': best_job.title if best_job else None,
+            'best_job': best_job['title'] if best_job else None,
             'jobs_analyzed': len(jobs),
             'evaluations_created': evaluations_created,
             'quick_feedback': f"Your resume shows {best_score:.1f}% relevance to available positions. "
-                            f"Best match: {best_job.title if best_job else 'N/A'}"
+                            f"Best match: {best_job['title'] if best_job else 'N/A'}"
         }
         
     except Exception as e:
+        # A failed bulk insert leaves the session unusable for the rest of the request
+        db.session.rollback()
         logging.error(f"Error in immediate evaluation: {str(e)}")
         return None
 
-def _evaluate_job_against_resumes(job: Job, parsed_job: dict) -> int:
-    """Evaluate job against existing resumes"""
+def _evaluate_job_task(job_id: int, parsed_job: dict) -> dict:
+    """Background task body for a new job upload"""
+    return {'evaluations_created': _evaluate_job_against_resumes(job_id, parsed_job)}
+
+def _evaluate_job_against_resumes(job_id: int, parsed_job: dict) -> int:
+    """Evaluate job against existing resumes; returns the number of evaluations created and raises on failure"""
     try:
-        # Get all processed resumes
-        resumes = Resume.query.filter_by(processing_status='processed').all()
+        # Tokenize the job once instead of once per resume
+        parsed_job = {**parsed_job, **matcher.preprocess_job(parsed_job.get('clean_text', ''))}
+        
+        job_key = f"job_{job_id}"
+        job_vector = embedding_manager.get_embeddings([job_key]).get(job_key)
+        if job_vector is None:
+            job_vectors = embedding_manager.embed_batch([parsed_job.get('clean_text', '')])
+            job_vector = job_vectors[0] if job_vectors is not None else None
+        
+        # Stream plain rows for processed resumes not yet evaluated against this job
+        already_evaluated = select(Evaluation.id).where(
+            Evaluation.resume_id == Resume.id,
+            Evaluation.job_id == job_id
+        ).exists()
+        resume_batches = db.session.execute(
+            select(
+                Resume.id,
+                Resume.content_text,
+                Resume.extracted_skills,
+                Resume.extracted_experience,
+                Resume.extracted_education,
+                Resume.extracted_projects,
+                Resume.extracted_certifications
+            ).where(
+                Resume.processing_status == 'processed',
+                ~already_evaluated
+            ).execution_options(yield_per=RESUME_BATCH_SIZE)
+        ).partitions()
         
         evaluations_created = 0
         
-        for resume in resumes:
+        for resumes in resume_batches:
+            # Embedding similarity for the whole batch in one matrix-vector product
+            similarities = {}
+            if job_vector is not None:
+                resume_ids, resume_matrix = embedding_manager.get_resume_embeddings([resume.id for resume in resumes])
+                if resume_ids:
+                    scores = embedding_manager.similarity_scores(resume_matrix, job_vector)
+                    similarities = dict(zip(resume_ids, scores.tolist()))
+                
+                # Resumes that were stored without an embedding get one, embedded together in one call
+                missing = [(resume.id, resume.content_text) for resume in resumes if resume.id not in similarities]
+                if missing:
+                    resume_ids, resume_matrix = embedding_manager.store_resume_embeddings(missing)
+                    if resume_ids:
+                        scores = embedding_manager.similarity_scores(resume_matrix, job_vector)
+                        similarities.update(zip(resume_ids, scores.tolist()))
+                
+                # Without a vector store, embed the rest in memory so every resume is scored alike
+                unstored = dict(item for item in missing if item[0] not in similarities)
+                if unstored:
+                    vectors = embedding_manager.document_vectors('resume', list(unstored.items()))
+                    if vectors:
+                        scores = embedding_manager.similarity_scores(np.stack(list(vectors.values())), job_vector)
+                        similarities.update(zip(vectors, scores.tolist()))
+            
             # Parse resume data
-            resume_data = {
+            batch_data = [{
                 'clean_text': resume.content_text,
                 'skills': resume.extracted_skills or [],
                 'experience': resume.extracted_experience or [],
                 'education': resume.extracted_education or [],
                 'projects': resume.extracted_projects or [],
                 'certifications': resume.extracted_certifications or []
-            }
+            } for resume in resumes]
             
-            # Perform matching
-            match_results = matcher.comprehensive_match(resume_data, parsed_job)
-            
-            # Calculate score
-            scoring_results = scorer.calculate_comprehensive_score(match_results)
-            
-            # Generate feedback
-            feedback_text = feedback_generator.generate_personalized_feedback(
-                resume_data, parsed_job, scoring_results, match_results
+            # Perform matching and scoring for the batch across worker processes
+            batch_results = match_and_score_all(
+                parsed_job, batch_data, [similarities.get(resume.id) for resume in resumes]
             )
             
-            # Create evaluation record
-            from models.evaluation import Evaluation
-            evaluation = Evaluation(
-                resume_id=resume.id,
-                job_id=job.id,
-                relevance_score=scoring_results['final_score'],
-                keyword_score=scoring_results['score_breakdown']['keyword_score'],
-                semantic_score=scoring_results['score_breakdown']['semantic_score'],
-                verdict=scoring_results['verdict'],
-                missing_skills=match_results.get('exact_skill_match', {}).get('missing_skills', []),
-                missing_projects=[],  # Would be extracted from job requirements
-                missing_certifications=[],  # Would be extracted from job requirements
-                feedback=feedback_text,
-                matched_skills=match_results.get('exact_skill_match', {}).get('matched_skills', []),
-                evaluation_date=datetime.utcnow()
-            )
+            evaluation_rows = []
+            for resume, resume_data, (match_results, scoring_results) in zip(resumes, batch_data, batch_results):
+                # Generate feedback
+                feedback_text = feedback_generator.generate_personalized_feedback(
+                    resume_data, parsed_job, scoring_results, match_results
+                )
+                
+                # Collect evaluation record for this batch's bulk insert
+                evaluation_rows.append({
+                    'resume_id': resume.id,
+                    'job_id': job_id,
+                    'relevance_score': scoring_results['final_score'],
+                    'keyword_score': scoring_results['score_breakdown']['keyword_score'],
+                    'semantic_score': scoring_results['score_breakdown']['semantic_score'],
+                    'verdict': scoring_results['verdict'],
+                    'missing_skills': match_results.get('exact_skill_match', {}).get('missing_skills', []),
+                    'missing_projects': [],  # Would be extracted from job requirements
+                    'missing_certifications': [],  # Would be extracted from job requirements
+                    'feedback': feedback_text,
+                    'matched_skills': match_results.get('exact_skill_match', {}).get('matched_skills', []),
+                    'evaluation_date': datetime.utcnow()
+                })
             
-            db.session.add(evaluation)
-            evaluations_created += 1
+            # Written per batch so memory stays bounded by RESUME_BATCH_SIZE;
+            # the transaction is still committed once at the end
+            Evaluation.bulk_create(evaluation_rows)
+            db.session.flush()
+            evaluations_created += len(evaluation_rows)
         
         db.session.commit()
         return evaluations_created
         
     except Exception as e:
+        # Re-raised so the background task is recorded as failed rather than completed
+        db.session.rollback()
         logging.error(f"Error evaluating job against resumes: {str(e)}")
-        return 0
\ No newline at end of file
+        raise
@@ -1,20 +1,76 @@
-import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
 import json
+import threading
+from config import config
+from models import LLMCache
+
+# Learning resources suggested for commonly missing skills
+_RESOURCE_MAP = MappingProxyType({
+    'python': ('Python.org Tutorial', 'Codecademy Python', 'Real Python'),
+    'javascript': ('MDN Web Docs', 'freeCodeCamp', 'JavaScript.info'),
+    'react': ('React Official Docs', 'React Tutorial', 'Create React App'),
+    'sql': ('W3Schools SQL', 'SQLBolt', 'MySQL Tutorial'),
+    'aws': ('AWS Training', 'A Cloud Guru', 'AWS Documentation'),
+    'docker': ('Docker Official Tutorial', 'Docker Hub', 'Play with Docker'),
+    'git': ('Git Tutorial', 'GitHub Learning Lab', 'Atlassian Git Tutorials')
+})
+
+_DEFAULT_RESOURCES = ('Google Search', 'YouTube Tutorials', 'Online Courses')
+
+@lru_cache(maxsize=256)
+def _learning_resources(skill: str) -> Tuple[str, ...]:
+    """Learning resources for a skill; a tuple so cached results can't be mutated"""
+    return _RESOURCE_MAP.get(skill.lower(), _DEFAULT_RESOURCES)
+
+@lru_cache(maxsize=256)
+def _job_prefix(job_title: str, company: str, required_skills: Tuple[str, ...],
+                preferred_skills: Tuple[str, ...]) -> str:
+    """System prompt shared by every resume evaluated against the same job"""
+    return f"""
+You are a career counselor helping a student improve their resume for job applications.
+
+Job Details:
+- Position: {job_title} at {company}
+- Required Skills: {', '.join(required_skills)}
+- Preferred Skills: {', '.join(preferred_skills)}
+
+Task: Provide personalized, actionable feedback to help this student improve their resume for this specific job. 
+
+Your feedback should:
+1. Acknowledge their strengths
+2. Identify the most critical gaps
+3. Provide specific, actionable recommendations
+4. Suggest learning resources or projects
+5. Be encouraging and constructive
+
+Focus on the top 3-5 most impactful improvements. Keep the response between 150-250 words.
+"""
 
 class FeedbackGenerator:
+    # Bump when the prompt template changes to invalidate cached responses
+    PROMPT_VERSION = '2'
+    MODEL_NAME = 'gemini-pro'
+    # Responses kept in process memory in front of the llm_cache table
+    MEMORY_CACHE_SIZE = 2048
+    
     def __init__(self):
-        self.api_key = os.getenv('GOOGLE_API_KEY')
+        self._memory_cache = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self.api_key = config.GOOGLE_API_KEY
         if self.api_key:
             try:
+                # Imported here so the LangChain stack is only loaded when LLM feedback is enabled
+                from langchain_google_genai import ChatGoogleGenerativeAI
                 self.llm = ChatGoogleGenerativeAI(
-                    model="gemini-pro",
+                    model=self.MODEL_NAME,
                     google_api_key=self.api_key,
-                    temperature=0.3
+                    temperature=0.3,
+                    # gemini-pro has no system role; the job prefix is sent as a leading turn
+                    convert_system_message_to_human=True
                 )
             except Exception as e:
                 logging.warning(f"Could not initialize Gemini: {str(e)}")
@@ -24,28 +80,70 @@ class FeedbackGenerator:
             self.llm = None
     
     def generate_personalized_feedback(self, resume_data: Dict, job_data: Dict, 
-                                     scoring_results: Dict, match_results: Dict) -> str:
-        """Generate personalized improvement feedback using LLM"""
-        if not self.llm:
+                                     scoring_results: Dict, match_results: Dict,
+                                     use_llm: bool = True) -> str:
+        """Generate personalized improvement feedback using LLM (rule-based when ``use_llm`` is False)"""
+        if not self.llm or not use_llm:
             return self._generate_fallback_feedback(scoring_results, match_results)
         
         try:
             # Prepare context for LLM
             context = self._prepare_feedback_context(resume_data, job_data, scoring_results, match_results)
             
-            # Create prompt
-            prompt = self._create_feedback_prompt(context)
+            # Create prompt: job prefix (shared across resumes) + resume suffix
+            prefix, suffix = self._create_feedback_prompt(context)
+            
+            # Reuse a previous response for an identical prompt
+            cache_key = LLMCache.make_key(self.MODEL_NAME, self.PROMPT_VERSION, prefix, suffix)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
             
             # Generate feedback
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            from langchain.schema import HumanMessage, SystemMessage
+            response = self.llm.invoke([SystemMessage(content=prefix), HumanMessage(content=suffix)])
             feedback = response.content.strip()
             
+            self._cache_store(cache_key, feedback)
             return feedback
             
         except Exception as e:
             logging.error(f"Error generating LLM feedback: {str(e)}")
             return self._generate_fallback_feedback(scoring_results, match_results)
     
+    def _cache_lookup(self, cache_key: str):
+        """Return cached feedback for a prompt hash, or None"""
+        with self._memory_lock:
+            if cache_key in self._memory_cache:
+                self._memory_cache.move_to_end(cache_key)
+                return self._memory_cache[cache_key]
+        
+        try:
+            cached = LLMCache.lookup(cache_key)
+        except Exception as e:
+            logging.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+        
+        if cached is not None:
+            self._remember(cache_key, cached)
+        return cached
+    
+    def _cache_store(self, cache_key: str, feedback: str):
+        """Persist generated feedback for a prompt hash"""
+        self._remember(cache_key, feedback)
+        try:
+            LLMCache.store(cache_key, self.PROMPT_VERSION, feedback)
+        except Exception as e:
+            logging.warning(f"LLM cache store failed: {str(e)}")
+    
+    def _remember(self, cache_key: str, feedback: str):
+        """Add feedback to the in-process LRU, evicting the least recently used entry"""
+        with self._memory_lock:
+            self._memory_cache[cache_key] = feedback
+            self._memory_cache.move_to_end(cache_key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
     def _prepare_feedback_context(self, resume_data: Dict, job_data: Dict, 
                                 scoring_results: Dict, match_results: Dict) -> Dict:
         """Prepare context for feedback generation"""
@@ -66,16 +164,19 @@ class FeedbackGenerator:
         }
         return context
     
-    def _create_feedback_prompt(self, context: Dict) -> str:
-        """Create detailed prompt for feedback generation"""
-        prompt = f"""
-You are a career counselor helping a student improve their resume for job applications.
-
-Job Details:
-- Position: {context['job_title']} at {context['company']}
-- Required Skills: {', '.join(context['job_required_skills'][:10])}
-- Preferred Skills: {', '.join(context['job_preferred_skills'][:5])}
-
+    def _create_feedback_prompt(self, context: Dict) -> Tuple[str, str]:
+        """Create the (job prefix, resume suffix) prompt pair for feedback generation"""
+        prefix = _job_prefix(
+            context['job_title'],
+            context['company'],
+            tuple(context['job_required_skills'][:10]),
+            tuple(context['job_preferred_skills'][:5])
+        )
+        return prefix, self._resume_suffix(context)
+    
+    def _resume_suffix(self, context: Dict) -> str:
+        """Per-resume part of the feedback prompt"""
+        return f"""
 Student's Resume Analysis:
 - Overall Relevance Score: {context['relevance_score']:.1f}/100
 - Verdict: {context['verdict']} suitability
@@ -85,20 +186,8 @@ Student's Resume Analysis:
 - Has Work Experience: {context['has_experience']}
 - Has Degree: {context['has_degree']}
 
-Task: Provide personalized, actionable feedback to help this student improve their resume for this specific job. 
-
-Your feedback should:
-1. Acknowledge their strengths
-2. Identify the most critical gaps
-3. Provide specific, actionable recommendations
-4. Suggest learning resources or projects
-5. Be encouraging and constructive
-
-Focus on the top 3-5 most impactful improvements. Keep the response between 150-250 words.
-
 Personalized Feedback:
 """
-        return prompt
     
     def _generate_fallback_feedback(self, scoring_results: Dict, match_results: Dict) -> str:
         """Generate rule-based feedback when LLM is not available"""
@@ -167,19 +256,7 @@ Personalized Feedback:
     
     def _get_learning_resources(self, skill: str) -> List[str]:
         """Get learning resources for specific skills"""
-        skill_lower = skill.lower()
-        
-        resource_map = {
-            'python': ['Python.org Tutorial', 'Codecademy Python', 'Real Python'],
-            'javascript': ['MDN Web Docs', 'freeCodeCamp', 'JavaScript.info'],
-            'react': ['React Official Docs', 'React Tutorial', 'Create React App'],
-            'sql': ['W3Schools SQL', 'SQLBolt', 'MySQL Tutorial'],
-            'aws': ['AWS Training', 'A Cloud Guru', 'AWS Documentation'],
-            'docker': ['Docker Official Tutorial', 'Docker Hub', 'Play with Docker'],
-            'git': ['Git Tutorial', 'GitHub Learning Lab', 'Atlassian Git Tutorials']
-        }
-        
-        return resource_map.get(skill_lower, ['Google Search', 'YouTube Tutorials', 'Online Courses'])
+        return list(_learning_resources(skill))
     
     def generate_skill_roadmap(self, current_skills: List[str], 
                              target_skills: List[str]) -> Dict:
@@ -1,11 +1,18 @@
+import os
 import re
 from typing import Dict, List, Tuple
+import joblib
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process, utils as fuzz_utils
 from rank_bm25 import BM25Okapi
 import numpy as np
 import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_DIGITS_RE = re.compile(r'\d+')
 
 class ResumeJobMatcher:
     def __init__(self):
@@ -15,17 +22,60 @@ class ResumeJobMatcher:
             ngram_range=(1, 2),
             lowercase=True
         )
+        # Vocabulary and IDF fitted on the stored corpus (see fit_tfidf); None
+        # until one has been saved, in which case each pair is fitted on its own
+        self.fitted_vectorizer = self._load_fitted_vectorizer()
+        
+    def _load_fitted_vectorizer(self):
+        """Load the saved corpus-fitted TF-IDF vectorizer, if there is one"""
+        path = getattr(Config, 'TFIDF_MODEL_PATH', None)
+        if not path or not os.path.exists(path):
+            return None
+        
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            logger.error("Error loading fitted TF-IDF vectorizer: %s", e)
+            return None
+    
+    def fit_tfidf(self, corpus) -> int:
+        """Fit TF-IDF on a document corpus and save it for every worker; returns the vocabulary size.
+
+        Running processes keep the vectorizer they loaded at startup until restarted.
+        """
+        vectorizer = clone(self.tfidf_vectorizer)
+        vectorizer.fit(corpus)
         
+        path = Config.TFIDF_MODEL_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(vectorizer, path)
+        
+        self.fitted_vectorizer = vectorizer
+        return len(vectorizer.vocabulary_)
+    
     def preprocess_text(self, text: str) -> List[str]:
         """Preprocess text for matching"""
         # Convert to lowercase and split into words
         words = re.findall(r'\b\w+\b', text.lower())
         return words
     
-    def exact_skill_match(self, resume_skills: List[str], job_skills: List[str]) -> Dict:
-        """Perform exact skill matching"""
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
+    def preprocess_job(self, job_text: str) -> Dict:
+        """Job-side artifacts that can be computed once and stored with the job"""
+        return {'tokens': self.preprocess_text(job_text)}
+    
+    def exact_skill_match(self, resume_skills: List[str], job_skills: List[str],
+                          resume_skills_lower: List[str] = None, job_skills_lower: List[str] = None,
+                          skill_counts: Tuple[int, int] = None) -> Dict:
+        """Perform exact skill matching (the ``*_lower`` lists are precomputed lowercase forms, if available).
+
+        ``skill_counts`` is ``(matched, total)`` from ``Skill.matched_counts``; when
+        given it sets the overlap score and the lists only supply skill names.
+        """
+        if resume_skills_lower is None:
+            resume_skills_lower = [skill.lower() for skill in resume_skills]
+        if job_skills_lower is None:
+            job_skills_lower = [skill.lower() for skill in job_skills]
+        resume_skills_lower = frozenset(resume_skills_lower)
         
         matched_skills = []
         missing_skills = []
@@ -36,39 +86,64 @@ class ResumeJobMatcher:
             else:
                 missing_skills.append(job_skill)
         
-        match_percentage = (len(matched_skills) / len(job_skills_lower)) * 100 if job_skills_lower else 0
+        matched_count, total_required = skill_counts or (len(matched_skills), len(job_skills_lower))
+        match_percentage = (matched_count / total_required) * 100 if total_required else 0
         
         return {
             'matched_skills': matched_skills,
             'missing_skills': missing_skills,
             'match_percentage': match_percentage,
-            'matched_count': len(matched_skills),
-            'total_required': len(job_skills_lower)
+            'matched_count': matched_count,
+            'total_required': total_required
         }
     
-    def fuzzy_skill_match(self, resume_skills: List[str], job_skills: List[str], threshold: int = 80) -> Dict:
-        """Perform fuzzy skill matching"""
+    def fuzzy_skill_match(self, resume_skills: List[str], job_skills: List[str], threshold: int = 80,
+                          resume_skills_lower: List[str] = None, job_skills_lower: List[str] = None) -> Dict:
+        """Perform fuzzy skill matching (the ``*_lower`` lists are precomputed lowercase forms, if available)"""
         matched_skills = []
         missing_skills = []
         skill_similarities = {}
         
-        for job_skill in job_skills:
-            best_match = None
-            best_score = 0
+        best_scores = [0] * len(job_skills)
+        best_matches = [None] * len(job_skills)
+        
+        if job_skills and resume_skills:
+            if job_skills_lower is None:
+                job_skills_lower = [skill.lower() for skill in job_skills]
+            if resume_skills_lower is None:
+                resume_skills_lower = [skill.lower() for skill in resume_skills]
             
-            for resume_skill in resume_skills:
-                # Use different fuzzy matching ratios
-                ratio = fuzz.ratio(job_skill.lower(), resume_skill.lower())
-                partial_ratio = fuzz.partial_ratio(job_skill.lower(), resume_skill.lower())
-                token_ratio = fuzz.token_sort_ratio(job_skill.lower(), resume_skill.lower())
+            # Identical skills score 100 without any fuzzy scoring
+            first_index = {}
+            for index, skill in enumerate(resume_skills_lower):
+                first_index.setdefault(skill, index)
+            fuzzy_rows = []
+            for row, skill in enumerate(job_skills_lower):
+                if skill in first_index:
+                    best_scores[row] = 100
+                    best_matches[row] = resume_skills[first_index[skill]]
+                else:
+                    fuzzy_rows.append(row)
+            
+            if fuzzy_rows:
+                fuzzy_job_skills = [job_skills_lower[row] for row in fuzzy_rows]
                 
-                # Take the maximum score
-                score = max(ratio, partial_ratio, token_ratio)
+                # Job x resume score matrices for each ratio, folded into the first
+                # in place to keep the maximum per pair
+                scores = process.cdist(fuzzy_job_skills, resume_skills_lower, scorer=fuzz.ratio, dtype=np.uint8)
+                np.maximum(scores, process.cdist(fuzzy_job_skills, resume_skills_lower,
+                                                 scorer=fuzz.partial_ratio, dtype=np.uint8), out=scores)
+                np.maximum(scores, process.cdist(fuzzy_job_skills, resume_skills_lower, scorer=fuzz.token_sort_ratio,
+                                                 processor=fuzz_utils.default_process, dtype=np.uint8), out=scores)
                 
-                if score > best_score:
-                    best_score = score
-                    best_match = resume_skill
-            
+                # First best-scoring resume skill for every remaining job skill
+                best_indices = scores.argmax(axis=1)
+                row_scores = scores[np.arange(len(fuzzy_rows)), best_indices].tolist()
+                for row, index, score in zip(fuzzy_rows, best_indices.tolist(), row_scores):
+                    best_scores[row] = score
+                    best_matches[row] = resume_skills[index]
+        
+        for job_skill, best_match, best_score in zip(job_skills, best_matches, best_scores):
             if best_score >= threshold:
                 matched_skills.append({
                     'job_skill': job_skill,
@@ -89,12 +164,15 @@ class ResumeJobMatcher:
             'threshold_used': threshold
         }
     
-    def keyword_match_bm25(self, resume_text: str, job_text: str) -> Dict:
-        """Perform BM25 keyword matching"""
+    def keyword_match_bm25(self, resume_text: str, job_text: str, job_words: List[str] = None,
+                           resume_words: List[str] = None) -> Dict:
+        """Perform BM25 keyword matching (``job_words``/``resume_words`` are precomputed tokens, if available)"""
         try:
             # Preprocess texts
-            resume_words = self.preprocess_text(resume_text)
-            job_words = self.preprocess_text(job_text)
+            if resume_words is None:
+                resume_words = self.preprocess_text(resume_text)
+            if job_words is None:
+                job_words = self.preprocess_text(job_text)
             
             # Create corpus
             corpus = [resume_words, job_words]
@@ -102,12 +180,18 @@ class ResumeJobMatcher:
             # Initialize BM25
             bm25 = BM25Okapi(corpus)
             
-            # Score resume against job description
-            job_score = bm25.get_scores(job_words)[0]  # Score of resume against job query
+            # Score each distinct job term against the resume once; the resume's
+            # score for the whole job query is the sum over the job's tokens
+            resume_freqs = bm25.doc_freqs[0]
+            length_norm = bm25.k1 * (1 - bm25.b + bm25.b * bm25.doc_len[0] / bm25.avgdl)
+            term_scores = {}
+            for word in set(job_words):
+                frequency = resume_freqs.get(word, 0)
+                term_scores[word] = bm25.idf.get(word, 0) * (frequency * (bm25.k1 + 1) / (frequency + length_norm))
+            job_score = sum(term_scores[word] for word in job_words)
             
             # Get top matching terms
-            job_word_scores = [(word, bm25.get_scores([word])[0]) for word in set(job_words)]
-            job_word_scores.sort(key=lambda x: x[1], reverse=True)
+            job_word_scores = sorted(term_scores.items(), key=lambda x: x[1], reverse=True)
             
             return {
                 'bm25_score': float(job_score),
@@ -116,7 +200,7 @@ class ResumeJobMatcher:
             }
             
         except Exception as e:
-            logging.error(f"Error in BM25 matching: {str(e)}")
+            logger.error("Error in BM25 matching: %s", e)
             return {
                 'bm25_score': 0.0,
                 'top_matching_terms': [],
@@ -126,33 +210,35 @@ class ResumeJobMatcher:
     def tfidf_similarity(self, resume_text: str, job_text: str) -> Dict:
         """Calculate TF-IDF cosine similarity"""
         try:
-            # Fit TF-IDF on both texts
             corpus = [resume_text, job_text]
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(corpus)
+            if self.fitted_vectorizer is not None:
+                # Corpus IDF: only transform (read-only, safe across request threads)
+                vectorizer = self.fitted_vectorizer
+                tfidf_matrix = vectorizer.transform(corpus)
+            else:
+                # Fit TF-IDF on both texts; a per-call clone keeps a shared
+                # matcher safe to use from several request threads
+                vectorizer = clone(self.tfidf_vectorizer)
+                tfidf_matrix = vectorizer.fit_transform(corpus)
             
-            # Calculate cosine similarity
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            similarity_score = similarity_matrix[0][1]  # Similarity between resume and job
+            # Rows are L2-normalized by the vectorizer, so the cosine is their dot product
+            similarity_score = tfidf_matrix[0].multiply(tfidf_matrix[1]).sum()
             
             # Get feature names and their importance
-            feature_names = self.tfidf_vectorizer.get_feature_names_out()
-            tfidf_scores = tfidf_matrix.toarray()
+            feature_names = vectorizer.get_feature_names_out()
             
-            # Get top features for job description
-            job_features = tfidf_scores[1]
-            top_features_idx = job_features.argsort()[-20:][::-1]  # Top 20 features
-            top_features = [(feature_names[idx], job_features[idx]) for idx in top_features_idx if job_features[idx] > 0]
+            top_features = self._top_features(tfidf_matrix.getrow(1), feature_names)
             
             return {
                 'tfidf_similarity': float(similarity_score),
                 'similarity_percentage': float(similarity_score * 100),
                 'top_job_features': top_features,
-                'resume_vector_size': tfidf_scores[0].shape[0],
-                'job_vector_size': tfidf_scores[1].shape[0]
+                'resume_vector_size': tfidf_matrix.shape[1],
+                'job_vector_size': tfidf_matrix.shape[1]
             }
             
         except Exception as e:
-            logging.error(f"Error in TF-IDF similarity: {str(e)}")
+            logger.error("Error in TF-IDF similarity: %s", e)
             return {
                 'tfidf_similarity': 0.0,
                 'similarity_percentage': 0.0,
@@ -161,8 +247,90 @@ class ResumeJobMatcher:
                 'job_vector_size': 0
             }
     
-    def comprehensive_match(self, resume_data: Dict, job_data: Dict) -> Dict:
-        """Perform comprehensive matching using multiple techniques"""
+    @staticmethod
+    def _top_features(row, feature_names, limit: int = 20) -> List[Tuple[str, float]]:
+        """Highest-weighted features of a sparse TF-IDF row, read from its stored values without densifying"""
+        top_count = min(limit, row.nnz)
+        top_positions = np.argpartition(-row.data, top_count - 1)[:top_count] if top_count else []
+        top_positions = sorted(top_positions, key=lambda position: row.data[position], reverse=True)
+        return [(feature_names[row.indices[position]], row.data[position]) for position in top_positions]
+    
+    def tfidf_similarity_jobs(self, resume_text: str, job_texts: List[str]) -> List[Dict]:
+        """TF-IDF similarity of one resume to many jobs.
+
+        With a corpus-fitted vectorizer all texts go through one transform and
+        one sparse product; otherwise each pair is fitted on its own.
+        """
+        if self.fitted_vectorizer is None or not job_texts:
+            return [self.tfidf_similarity(resume_text, job_text) for job_text in job_texts]
+        
+        try:
+            vectorizer = self.fitted_vectorizer
+            tfidf_matrix = vectorizer.transform([resume_text] + list(job_texts))
+            job_rows = tfidf_matrix[1:]
+            
+            # Rows are L2-normalized, so one sparse product gives every cosine
+            similarities = (job_rows @ tfidf_matrix.getrow(0).T).toarray().ravel()
+            feature_names = vectorizer.get_feature_names_out()
+            
+            return [{
+                'tfidf_similarity': float(similarity),
+                'similarity_percentage': float(similarity * 100),
+                'top_job_features': self._top_features(job_rows.getrow(index), feature_names),
+                'resume_vector_size': tfidf_matrix.shape[1],
+                'job_vector_size': tfidf_matrix.shape[1]
+            } for index, similarity in enumerate(similarities)]
+            
+        except Exception as e:
+            logger.error("Error in multi-job TF-IDF similarity: %s", e)
+            return [self.tfidf_similarity(resume_text, job_text) for job_text in job_texts]
+    
+    def tfidf_similarity_batch(self, resume_texts: List[str], job_text: str) -> List[Dict]:
+        """TF-IDF similarity of many resumes to one job.
+
+        With a corpus-fitted vectorizer this is one transform and one sparse
+        product for the whole batch; the job's top features are the same for
+        every resume and computed once. Otherwise each pair is fitted on its own.
+        """
+        if self.fitted_vectorizer is None or not resume_texts:
+            return [self.tfidf_similarity(resume_text, job_text) for resume_text in resume_texts]
+        
+        try:
+            vectorizer = self.fitted_vectorizer
+            tfidf_matrix = vectorizer.transform(list(resume_texts) + [job_text])
+            job_row = tfidf_matrix.getrow(len(resume_texts))
+            
+            # Rows are L2-normalized, so one sparse product gives every cosine
+            similarities = (tfidf_matrix[:len(resume_texts)] @ job_row.T).toarray().ravel()
+            
+            top_features = self._top_features(job_row, vectorizer.get_feature_names_out())
+            
+            return [{
+                'tfidf_similarity': float(similarity),
+                'similarity_percentage': float(similarity * 100),
+                'top_job_features': top_features,
+                'resume_vector_size': tfidf_matrix.shape[1],
+                'job_vector_size': tfidf_matrix.shape[1]
+            } for similarity in similarities]
+            
+        except Exception as e:
+            logger.error("Error in batch TF-IDF similarity: %s", e)
+            return [self.tfidf_similarity(resume_text, job_text) for resume_text in resume_texts]
+    
+    def comprehensive_match_batch(self, resumes_data: List[Dict], job_data: Dict) -> List[Dict]:
+        """Match many resumes against one job, sharing the job-side TF-IDF work"""
+        tfidf_matches = self.tfidf_similarity_batch(
+            [resume_data.get('clean_text', '') for resume_data in resumes_data],
+            job_data.get('clean_text', '')
+        )
+        return [
+            self.comprehensive_match(resume_data, job_data, tfidf_match)
+            for resume_data, tfidf_match in zip(resumes_data, tfidf_matches)
+        ]
+    
+    def comprehensive_match(self, resume_data: Dict, job_data: Dict, tfidf_match: Dict = None,
+                            skill_counts: Tuple[int, int] = None) -> Dict:
+        """Perform comprehensive matching using multiple techniques (``tfidf_match`` and ``skill_counts`` if already computed)"""
         try:
             # Extract relevant data
             resume_skills = resume_data.get('skills', [])
@@ -172,11 +340,25 @@ class ResumeJobMatcher:
             resume_text = resume_data.get('clean_text', '')
             job_text = job_data.get('clean_text', '')
             
+            # Lowercase each skill list once for both skill matchers
+            resume_skills_lower = [skill.lower() for skill in resume_skills]
+            required_skills_lower = [skill.lower() for skill in job_required_skills]
+            preferred_skills_lower = [skill.lower() for skill in job_preferred_skills]
+            
             # Perform different types of matching
-            exact_match = self.exact_skill_match(resume_skills, job_required_skills)
-            fuzzy_match = self.fuzzy_skill_match(resume_skills, job_required_skills + job_preferred_skills)
-            bm25_match = self.keyword_match_bm25(resume_text, job_text)
-            tfidf_match = self.tfidf_similarity(resume_text, job_text)
+            exact_match = self.exact_skill_match(
+                resume_skills, job_required_skills,
+                resume_skills_lower=resume_skills_lower, job_skills_lower=required_skills_lower,
+                skill_counts=skill_counts
+            )
+            fuzzy_match = self.fuzzy_skill_match(
+                resume_skills, job_required_skills + job_preferred_skills,
+                resume_skills_lower=resume_skills_lower,
+                job_skills_lower=required_skills_lower + preferred_skills_lower
+            )
+            bm25_match = self.keyword_match_bm25(resume_text, job_text, job_data.get('tokens'), resume_data.get('tokens'))
+            if tfidf_match is None:
+                tfidf_match = self.tfidf_similarity(resume_text, job_text)
             
             # Calculate additional metrics
             experience_match = self._match_experience(resume_data, job_data)
@@ -197,7 +379,7 @@ class ResumeJobMatcher:
             }
             
         except Exception as e:
-            logging.error(f"Error in comprehensive matching: {str(e)}")
+            logger.error("Error in comprehensive matching: %s", e)
             return {'error': str(e)}
     
     def _match_experience(self, resume_data: Dict, job_data: Dict) -> Dict:
@@ -205,17 +387,15 @@ class ResumeJobMatcher:
         resume_exp = resume_data.get('experience', [])
         job_exp_req = job_data.get('experience_requirements', [])
         
-        # Extract years of experience
-        resume_years = []
-        for exp in resume_exp:
-            if isinstance(exp, dict) and 'years' in exp:
-                try:
-                    years = int(exp['years'])
-                    resume_years.append(years)
-                except (ValueError, TypeError):
-                    continue
-        
-        max_resume_years = max(resume_years) if resume_years else 0
+        # Extract years of experience; entries without a plain number (e.g. None) are skipped
+        max_resume_years = max((
+            int(years.group())
+            for years in (
+                _DIGITS_RE.fullmatch(str(exp['years']).strip())
+                for exp in resume_exp if isinstance(exp, dict) and 'years' in exp
+            )
+            if years
+        ), default=0)
         
         # Simple experience matching (can be enhanced)
         return {
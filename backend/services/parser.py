@@ -1,19 +1,59 @@
 import fitz  # PyMuPDF
 import docx
 import docx2txt
+import io
 import re
-import spacy
+import copy
+import hashlib
+import threading
+import ahocorasick
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional
 import logging
+from models_nlp import NLP as nlp
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logging.warning("spaCy model 'en_core_web_sm' not found. Install it with: python -m spacy download en_core_web_sm")
-    nlp = None
+logger = logging.getLogger(__name__)
+
+# Patterns compiled once at import rather than looked up on every parse call
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\-\+\#\(\)\/]')
+_DIGITS_RE = re.compile(r'\d+')
+
+# Common experience patterns
+_EXPERIENCE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d+)\s*(years?|yrs?)\s*(of\s*)?(experience|exp)',
+    r'(experience|exp)\s*:?\s*(\d+)\s*(years?|yrs?)',
+    r'(\d+)\+?\s*(years?|yrs?)'
+))
+
+# Sections that might contain projects, and the delimiters between project lines
+_PROJECT_SECTION_RE = re.compile(
+    r'(projects?|portfolio|work samples?)[\s\:]*([^\n]*(?:\n(?!\s*\n)[^\n]*)*)',
+    re.IGNORECASE | re.MULTILINE
+)
+_PROJECT_SPLIT_RE = re.compile(r'[\n\•\-\*]')
+
+# Common certification patterns
+_CERTIFICATION_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'certified?\s+[\w\s]+',
+    r'[\w\s]*\s*certification',
+    r'aws\s+[\w\s]*',
+    r'google\s+[\w\s]*certified',
+    r'microsoft\s+[\w\s]*certified',
+    r'cisco\s+[\w\s]*',
+    r'oracle\s+[\w\s]*certified'
+))
+
+@lru_cache(maxsize=64)
+def _section_re(keyword: str):
+    """Compiled pattern for the section introduced by ``keyword``"""
+    return re.compile(rf'{re.escape(keyword)}[\s\:]*([^\n]*(?:\n(?!\s*\n)[^\n]*)*)', re.IGNORECASE | re.MULTILINE)
 
 class DocumentParser:
+    # Parsed resumes kept per process, keyed by a hash of the uploaded bytes
+    PARSE_CACHE_SIZE = 128
+    
     def __init__(self):
         self.skills_keywords = [
             'python', 'java', 'javascript', 'react', 'nodejs', 'sql', 'mongodb',
@@ -24,6 +64,12 @@ class DocumentParser:
             'machine learning', 'deep learning', 'data science', 'artificial intelligence'
         ]
         
+        # Aho-Corasick automaton finding every skill keyword in one pass over the text
+        self._skills_automaton = ahocorasick.Automaton()
+        for skill in self.skills_keywords:
+            self._skills_automaton.add_word(skill.lower(), skill)
+        self._skills_automaton.make_automaton()
+        
         self.education_patterns = [
             r'b\.?tech|bachelor of technology|btech',
             r'm\.?tech|master of technology|mtech',
@@ -35,18 +81,23 @@ class DocumentParser:
             r'bca|bachelor of computer applications',
             r'phd|doctorate'
         ]
+        
+        # All degree patterns in one alternation; the group name records which pattern matched
+        self._education_re = re.compile(
+            '|'.join(f'(?P<edu{index}>{pattern})' for index, pattern in enumerate(self.education_patterns)),
+            re.IGNORECASE
+        )
+        
+        self._parse_cache = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            text = ""
-            doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            with fitz.open(file_path) as doc:
+                return "".join(page.get_text() for page in doc)
         except Exception as e:
-            logging.error(f"Error extracting text from PDF: {str(e)}")
+            logger.error("Error extracting text from PDF: %s", e)
             return ""
     
     def extract_text_from_docx(self, file_path: str) -> str:
@@ -62,8 +113,32 @@ class DocumentParser:
             
             return text
         except Exception as e:
-            logging.error(f"Error extracting text from DOCX: {str(e)}")
+            logger.error("Error extracting text from DOCX: %s", e)
+            return ""
+    
+    def extract_text_from_stream(self, stream, filename: str) -> str:
+        """Extract text from an uploaded file stream, using ``filename`` for the format"""
+        try:
+            if filename.lower().endswith('.pdf'):
+                with fitz.open(stream=stream.read(), filetype='pdf') as doc:
+                    return "".join(page.get_text() for page in doc)
+            elif filename.lower().endswith(('.docx', '.doc')):
+                doc = docx.Document(stream)
+                text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+                
+                # If empty, try with docx2txt
+                if not text.strip():
+                    stream.seek(0)
+                    text = docx2txt.process(stream)
+                
+                return text
+            elif filename.lower().endswith('.txt'):
+                return stream.read().decode('utf-8')
+        except Exception as e:
+            logger.error("Error extracting text from upload stream: %s", e)
             return ""
+        
+        raise ValueError("Unsupported file format")
     
     def extract_text(self, file_path: str) -> str:
         """Extract text from file based on extension"""
@@ -77,23 +152,20 @@ class DocumentParser:
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         # Remove special characters but keep alphanumeric and common punctuation
-        text = re.sub(r'[^\w\s\.\,\-\+\#\(\)\/]', ' ', text)
+        text = _SPECIAL_CHARS_RE.sub(' ', text)
         return text.strip()
     
-    def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skills_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+    def extract_skills(self, text: str, doc=None, text_lower: str = None) -> List[str]:
+        """Extract skills from text (``doc``/``text_lower`` are its spaCy doc and lowercase form, if already computed)"""
+        if text_lower is None:
+            text_lower = text.lower()
+        found_skills = list({skill for _, skill in self._skills_automaton.iter(text_lower)})
         
         # Use spaCy for additional entity extraction if available
         if nlp:
-            doc = nlp(text)
+            doc = doc if doc is not None else nlp(text)
             for ent in doc.ents:
                 if ent.label_ in ['ORG', 'PRODUCT'] and len(ent.text) > 2:
                     # Filter for technology-related entities
@@ -102,48 +174,49 @@ class DocumentParser:
         
         return list(set(found_skills))  # Remove duplicates
     
-    def extract_education(self, text: str) -> List[Dict]:
-        """Extract education information"""
-        education = []
-        text_lower = text.lower()
+    def extract_education(self, text: str, text_lower: str = None) -> List[Dict]:
+        """Extract education information (``text_lower`` is the text's lowercase form, if already computed)"""
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for pattern in self.education_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                # Extract surrounding context for more details
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 100)
-                context = text[start:end]
-                
-                education.append({
-                    'degree': match.group(),
-                    'context': context.strip()
-                })
+        # One scan for all patterns, reported in pattern order as before
+        matches = sorted(
+            self._education_re.finditer(text_lower),
+            key=lambda match: (int(match.lastgroup[len('edu'):]), match.start())
+        )
+        
+        education = []
+        for match in matches:
+            # Extract surrounding context for more details
+            start = max(0, match.start() - 50)
+            end = min(len(text), match.end() + 100)
+            context = text[start:end]
+            
+            education.append({
+                'degree': match.group(),
+                'context': context.strip()
+            })
         
         return education
     
-    def extract_experience(self, text: str) -> List[Dict]:
-        """Extract work experience"""
+    def extract_experience(self, text: str, doc=None) -> List[Dict]:
+        """Extract work experience (``doc`` is the text's spaCy doc, if already computed)"""
         experience = []
         
         # Look for common experience patterns
-        experience_patterns = [
-            r'(\d+)\s*(years?|yrs?)\s*(of\s*)?(experience|exp)',
-            r'(experience|exp)\s*:?\s*(\d+)\s*(years?|yrs?)',
-            r'(\d+)\+?\s*(years?|yrs?)'
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in _EXPERIENCE_RES:
+            matches = pattern.finditer(text)
             for match in matches:
+                matched_text = match.group()
+                numbers = _DIGITS_RE.findall(matched_text)
                 experience.append({
-                    'text': match.group(),
-                    'years': re.findall(r'\d+', match.group())[0] if re.findall(r'\d+', match.group()) else None
+                    'text': matched_text,
+                    'years': numbers[0] if numbers else None
                 })
         
         # Extract job titles and companies using spaCy if available
         if nlp:
-            doc = nlp(text)
+            doc = doc if doc is not None else nlp(text)
             organizations = [ent.text for ent in doc.ents if ent.label_ == 'ORG']
             if organizations:
                 experience.extend([{'company': org} for org in organizations[:5]])  # Top 5
@@ -155,13 +228,12 @@ class DocumentParser:
         projects = []
         
         # Look for sections that might contain projects
-        project_sections = re.finditer(r'(projects?|portfolio|work samples?)[\s\:]*([^\n]*(?:\n(?!\s*\n)[^\n]*)*)', 
-                                     text, re.IGNORECASE | re.MULTILINE)
+        project_sections = _PROJECT_SECTION_RE.finditer(text)
         
         for section in project_sections:
             project_text = section.group(2)
             # Split by common delimiters
-            project_lines = re.split(r'[\n\•\-\*]', project_text)
+            project_lines = _PROJECT_SPLIT_RE.split(project_text)
             for line in project_lines:
                 line = line.strip()
                 if len(line) > 10:  # Filter out very short lines
@@ -173,19 +245,8 @@ class DocumentParser:
         """Extract certification information"""
         certifications = []
         
-        # Common certification patterns
-        cert_patterns = [
-            r'certified?\s+[\w\s]+',
-            r'[\w\s]*\s*certification',
-            r'aws\s+[\w\s]*',
-            r'google\s+[\w\s]*certified',
-            r'microsoft\s+[\w\s]*certified',
-            r'cisco\s+[\w\s]*',
-            r'oracle\s+[\w\s]*certified'
-        ]
-        
-        for pattern in cert_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in _CERTIFICATION_RES:
+            matches = pattern.finditer(text)
             for match in matches:
                 cert_text = match.group().strip()
                 if len(cert_text) > 5:
@@ -196,43 +257,76 @@ class DocumentParser:
     def parse_resume(self, file_path: str) -> Dict:
         """Parse resume and extract all information"""
         try:
-            # Extract raw text
-            raw_text = self.extract_text(file_path)
-            if not raw_text:
-                return {'error': 'Could not extract text from file'}
-            
-            # Clean text
-            clean_text = self.clean_text(raw_text)
+            return self._parse_resume_text(self.extract_text(file_path))
+        except Exception as e:
+            logger.error("Error parsing resume: %s", e)
+            return {'error': str(e)}
+    
+    def parse_resume_stream(self, stream, filename: str) -> Dict:
+        """Parse an uploaded resume straight from its stream, without saving it first.
+
+        Identical uploads (same bytes and file type) reuse the earlier result.
+        """
+        try:
+            content = stream.read()
+            key = (hashlib.blake2b(content, digest_size=16).hexdigest(), filename.rsplit('.', 1)[-1].lower())
             
-            # Extract structured information
-            parsed_data = {
-                'raw_text': raw_text,
-                'clean_text': clean_text,
-                'skills': self.extract_skills(clean_text),
-                'education': self.extract_education(clean_text),
-                'experience': self.extract_experience(clean_text),
-                'projects': self.extract_projects(clean_text),
-                'certifications': self.extract_certifications(clean_text)
-            }
+            with self._parse_cache_lock:
+                cached = self._parse_cache.get(key)
+                if cached is not None:
+                    self._parse_cache.move_to_end(key)
+                    return copy.deepcopy(cached)
             
+            parsed_data = self._parse_resume_text(self.extract_text_from_stream(io.BytesIO(content), filename))
+            if 'error' not in parsed_data:
+                with self._parse_cache_lock:
+                    self._parse_cache[key] = copy.deepcopy(parsed_data)
+                    if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                        self._parse_cache.popitem(last=False)
             return parsed_data
-            
         except Exception as e:
-            logging.error(f"Error parsing resume: {str(e)}")
+            logger.error("Error parsing resume: %s", e)
             return {'error': str(e)}
     
+    def _parse_resume_text(self, raw_text: str) -> Dict:
+        """Extract all resume information from its raw text"""
+        if not raw_text:
+            return {'error': 'Could not extract text from file'}
+        
+        # Clean text
+        clean_text = self.clean_text(raw_text)
+        
+        # Run the NER pipeline and lowercase the text once for all extractors
+        doc = nlp(clean_text) if nlp else None
+        clean_text_lower = clean_text.lower()
+        
+        # Extract structured information
+        parsed_data = {
+            'raw_text': raw_text,
+            'clean_text': clean_text,
+            'skills': self.extract_skills(clean_text, doc, clean_text_lower),
+            'education': self.extract_education(clean_text, clean_text_lower),
+            'experience': self.extract_experience(clean_text, doc),
+            'projects': self.extract_projects(clean_text),
+            'certifications': self.extract_certifications(clean_text)
+        }
+        
+        return parsed_data
+    
     def parse_job_description(self, text: str) -> Dict:
         """Parse job description and extract requirements"""
         try:
             clean_text = self.clean_text(text)
+            doc = nlp(clean_text) if nlp else None
+            clean_text_lower = clean_text.lower()
             
             # Extract job requirements
             parsed_data = {
                 'raw_text': text,
                 'clean_text': clean_text,
-                'required_skills': self.extract_skills(clean_text),
-                'education_requirements': self.extract_education(clean_text),
-                'experience_requirements': self.extract_experience(clean_text),
+                'required_skills': self.extract_skills(clean_text, doc, clean_text_lower),
+                'education_requirements': self.extract_education(clean_text, clean_text_lower),
+                'experience_requirements': self.extract_experience(clean_text, doc),
                 'certifications': self.extract_certifications(clean_text)
             }
             
@@ -247,14 +341,13 @@ class DocumentParser:
             return parsed_data
             
         except Exception as e:
-            logging.error(f"Error parsing job description: {str(e)}")
+            logger.error("Error parsing job description: %s", e)
             return {'error': str(e)}
     
     def _extract_section(self, text: str, keywords: List[str]) -> str:
         """Extract specific sections from text based on keywords"""
         for keyword in keywords:
-            pattern = rf'{keyword}[\s\:]*([^\n]*(?:\n(?!\s*\n)[^\n]*)*)'
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            match = _section_re(keyword).search(text)
             if match:
                 return match.group(1).strip()
         return ""
\ No newline at end of file
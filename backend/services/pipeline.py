@@ -0,0 +1,79 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from services.matcher import ResumeJobMatcher
+from services.scorer import RelevanceScorer
+
+# Worker processes used for matching; 0 runs everything in the calling process.
+# Every gunicorn worker owns its own pool (each process loading spaCy and
+# sentence-transformers), so by default the cores are split between them.
+MATCH_PROCESSES = int(os.environ.get(
+    'MATCH_PROCESSES',
+    max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', '4')))
+))
+
+# Below this many pairs the pickling round-trip costs more than it saves
+MIN_PARALLEL_PAIRS = 8
+
+_matcher = None
+_scorer = None
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def _init_worker():
+    """Build the matcher and scorer once per worker process"""
+    global _matcher, _scorer
+    _matcher = ResumeJobMatcher()
+    _scorer = RelevanceScorer()
+
+def match_and_score_batch(args: Tuple[List[Dict], Dict, List[Optional[float]]]) -> List[Tuple[Dict, Dict]]:
+    """Match several resumes against one job and score them; returns (match_results, scoring_results) per resume"""
+    resumes_data, job_data, embedding_similarities = args
+    if _matcher is None:
+        _init_worker()
+    
+    all_match_results = _matcher.comprehensive_match_batch(resumes_data, job_data)
+    return [
+        (match_results, _scorer.calculate_comprehensive_score(match_results, embedding_similarity))
+        for match_results, embedding_similarity in zip(all_match_results, embedding_similarities)
+    ]
+
+def _get_executor():
+    """Process pool for the current process, created on first use.
+
+    Workers are spawned rather than forked so they never inherit the web
+    worker's threads, DB connections or model state.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=MATCH_PROCESSES,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+def match_and_score_all(job_data: Dict, resumes_data: List[Dict],
+                        embedding_similarities: List[Optional[float]],
+                        chunksize: int = 16) -> List[Tuple[Dict, Dict]]:
+    """Match and score resumes against one job, in chunks across the process pool when worthwhile"""
+    if MATCH_PROCESSES <= 0 or len(resumes_data) < MIN_PARALLEL_PAIRS:
+        return match_and_score_batch((resumes_data, job_data, embedding_similarities))
+    
+    # The job is sent once per chunk rather than once per resume
+    chunks = [
+        (resumes_data[start:start + chunksize], job_data, embedding_similarities[start:start + chunksize])
+        for start in range(0, len(resumes_data), chunksize)
+    ]
+    try:
+        return [result for batch in _get_executor().map(match_and_score_batch, chunks) for result in batch]
+    except Exception as e:
+        logging.error(f"Process pool matching failed, running inline: {str(e)}")
+        return match_and_score_batch((resumes_data, job_data, embedding_similarities))
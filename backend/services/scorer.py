@@ -2,6 +2,8 @@ from typing import Dict, Tuple
 import logging
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 class RelevanceScorer:
     def __init__(self):
         self.semantic_weight = getattr(Config, 'SEMANTIC_WEIGHT', 0.6)
@@ -27,7 +29,7 @@ class RelevanceScorer:
             return min(keyword_score, 100.0)  # Cap at 100
             
         except Exception as e:
-            logging.error(f"Error calculating keyword score: {str(e)}")
+            logger.error("Error calculating keyword score: %s", e)
             return 0.0
     
     def calculate_semantic_score(self, match_results: Dict, embedding_similarity: float = None) -> float:
@@ -47,7 +49,7 @@ class RelevanceScorer:
             return min(semantic_score, 100.0)  # Cap at 100
             
         except Exception as e:
-            logging.error(f"Error calculating semantic score: {str(e)}")
+            logger.error("Error calculating semantic score: %s", e)
             return 0.0
     
     def calculate_weighted_score(self, keyword_score: float, semantic_score: float) -> float:
@@ -61,7 +63,7 @@ class RelevanceScorer:
             return min(weighted_score, 100.0)  # Cap at 100
             
         except Exception as e:
-            logging.error(f"Error calculating weighted score: {str(e)}")
+            logger.error("Error calculating weighted score: %s", e)
             return 0.0
     
     def calculate_bonus_scores(self, match_results: Dict) -> float:
@@ -87,7 +89,7 @@ class RelevanceScorer:
             return min(bonus_score, 15.0)  # Cap bonus at 15 points
             
         except Exception as e:
-            logging.error(f"Error calculating bonus scores: {str(e)}")
+            logger.error("Error calculating bonus scores: %s", e)
             return 0.0
     
     def determine_verdict(self, final_score: float) -> str:
@@ -139,7 +141,7 @@ class RelevanceScorer:
             return scoring_details
             
         except Exception as e:
-            logging.error(f"Error in comprehensive scoring: {str(e)}")
+            logger.error("Error in comprehensive scoring: %s", e)
             return {
                 'final_score': 0.0,
                 'verdict': 'Low',
@@ -182,7 +184,7 @@ class RelevanceScorer:
             return missing_elements
             
         except Exception as e:
-            logging.error(f"Error generating missing elements: {str(e)}")
+            logger.error("Error generating missing elements: %s", e)
             return {
                 'skills': [],
                 'certifications': [],
@@ -217,5 +219,5 @@ class RelevanceScorer:
             return skill_analysis
             
         except Exception as e:
-            logging.error(f"Error in skill gap analysis: {str(e)}")
+            logger.error("Error in skill gap analysis: %s", e)
             return {}
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from models import EvaluationTask
+
+# Background threads per web worker process running evaluation tasks
+EVALUATION_TASK_WORKERS = int(os.environ.get('EVALUATION_TASK_WORKERS', '2'))
+
+# Unfinished tasks are heartbeated this often by their worker process; those
+# silent for TASK_STALE_SECONDS belonged to a worker that exited and are failed
+TASK_HEARTBEAT_SECONDS = 30
+TASK_STALE_SECONDS = int(os.environ.get('TASK_STALE_SECONDS', '300'))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Ids of this process's queued or running tasks, and the thread heartbeating them
+_live_tasks = set()
+_heartbeat_pid = None
+
+def _get_executor():
+    """Thread pool for the current process, created on first use (after any fork)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=EVALUATION_TASK_WORKERS,
+                thread_name_prefix='evaluation-task'
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+def _heartbeat_loop(app):
+    while True:
+        time.sleep(TASK_HEARTBEAT_SECONDS)
+        with _executor_lock:
+            task_ids = list(_live_tasks)
+        try:
+            with app.app_context():
+                EvaluationTask.heartbeat(task_ids)
+        except Exception as e:
+            logging.warning(f"Task heartbeat failed: {str(e)}")
+
+def _track_task(app, task_id: str):
+    """Add a task to this process's heartbeat, starting the heartbeat thread on first use (after any fork)"""
+    global _heartbeat_pid
+    with _executor_lock:
+        if _heartbeat_pid != os.getpid():
+            _live_tasks.clear()
+            threading.Thread(target=_heartbeat_loop, args=(app,), name='evaluation-task-heartbeat', daemon=True).start()
+            _heartbeat_pid = os.getpid()
+        _live_tasks.add(task_id)
+
+def fail_stale_tasks() -> int:
+    """Fail tasks whose worker stopped heartbeating them (e.g. it was restarted or killed)"""
+    return EvaluationTask.fail_stale(TASK_STALE_SECONDS)
+
+def submit_task(kind: str, target_id: int, fn, *args) -> str:
+    """Run ``fn(*args)`` in the background and return a task id for status polling.
+
+    ``fn`` runs inside its own app context (and so its own DB session) and
+    returns a JSON-serializable result stored on the task row.
+    """
+    app = current_app._get_current_object()
+    task_id = EvaluationTask.create(kind, target_id)
+    _track_task(app, task_id)
+    
+    def run():
+        with app.app_context():
+            try:
+                EvaluationTask.mark(task_id, 'running')
+                try:
+                    result = fn(*args)
+                except Exception as e:
+                    logging.error(f"Background task {task_id} ({kind}) failed: {str(e)}")
+                    EvaluationTask.mark(task_id, 'failed', error=str(e))
+                else:
+                    EvaluationTask.mark(task_id, 'completed', result=result)
+            finally:
+                with _executor_lock:
+                    _live_tasks.discard(task_id)
+    
+    _get_executor().submit(run)
+    return task_id
@@ -1,30 +1,83 @@
 import os
+import atexit
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
+from models_nlp import EMBEDDER, EMBEDDING_MODEL_NAME
+
+COLLECTION_NAME = "resume_job_embeddings"
+
+# HNSW index parameters, fixed when the collection is created. Larger M and
+# construction_ef raise recall at the cost of build time and memory; search_ef
+# trades query latency for recall (Chroma's defaults are 16/100/10).
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 24,
+    "hnsw:construction_ef": 128,
+    "hnsw:search_ef": 100,
+    "hnsw:num_threads": os.cpu_count() or 1
+}
 
 class EmbeddingManager:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    # Recently generated embeddings kept in memory, keyed by text hash
+    EMBEDDING_CACHE_SIZE = 4096
+    
+    # Single-document stores are buffered and written in one batch once this
+    # many are pending, after WRITE_FLUSH_SECONDS, or before a read that needs them
+    WRITE_BATCH_SIZE = 128
+    WRITE_FLUSH_SECONDS = 2.0
+    
+    # Flushes a buffered document is retried in before it is dropped (and logged)
+    WRITE_MAX_ATTEMPTS = 3
+    
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
         """Initialize embedding manager with sentence transformer model"""
+        self.model_name = model_name
         try:
-            self.model = SentenceTransformer(model_name)
+            if model_name == EMBEDDING_MODEL_NAME and EMBEDDER is not None:
+                # Reuse the process-wide model loaded at import time
+                self.model = EMBEDDER
+            else:
+                self.model = SentenceTransformer(model_name)
+                logging.info(f"Loaded embedding model: {model_name}")
             self.embedding_dimension = self.model.get_sentence_embedding_dimension()
-            logging.info(f"Loaded embedding model: {model_name}")
         except Exception as e:
             logging.error(f"Error loading embedding model: {str(e)}")
             self.model = None
             self.embedding_dimension = 384  # Default dimension
         
-        # Initialize ChromaDB
+        # ChromaDB is opened lazily, once per process: its SQLite handle is not
+        # fork-safe, so it must not be created in a preloading master.
         self.chroma_client = None
-        self.collection = None
-        self._init_vector_store()
+        self._collection = None
+        self._store_pid = None
+        
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        self._pending_writes = []
+        # Documents taken by the flush in progress, still unreadable from the collection
+        self._flushing_writes = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.flush)
+    
+    @property
+    def collection(self):
+        if self._store_pid != os.getpid():
+            self._init_vector_store()
+        return self._collection
     
     def _init_vector_store(self):
         """Initialize ChromaDB vector store"""
+        self._store_pid = os.getpid()
         try:
             persist_directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'vector_store')
             os.makedirs(persist_directory, exist_ok=True)
@@ -33,11 +86,16 @@ class EmbeddingManager:
             
             # Create or get collection
             try:
-                self.collection = self.chroma_client.get_collection(name="resume_job_embeddings")
+                self._collection = self.chroma_client.get_collection(name=COLLECTION_NAME)
+                if (self._collection.metadata or {}).get("hnsw:M") != HNSW_METADATA["hnsw:M"]:
+                    logging.warning(
+                        "Vector store uses default HNSW parameters; run "
+                        "`flask --app app rebuild-vector-index` off-hours to apply the tuned ones"
+                    )
             except:
-                self.collection = self.chroma_client.create_collection(
-                    name="resume_job_embeddings",
-                    metadata={"hnsw:space": "cosine"}
+                self._collection = self.chroma_client.create_collection(
+                    name=COLLECTION_NAME,
+                    metadata=HNSW_METADATA
                 )
             
             logging.info("ChromaDB vector store initialized successfully")
@@ -45,7 +103,45 @@ class EmbeddingManager:
         except Exception as e:
             logging.error(f"Error initializing vector store: {str(e)}")
             self.chroma_client = None
-            self.collection = None
+            self._collection = None
+    
+    def rebuild_collection(self, batch_size: int = 1000) -> int:
+        """Recreate the collection with HNSW_METADATA, re-adding every stored embedding.
+
+        The whole collection is held in memory while the index is rebuilt, so
+        run it off-hours. Returns the number of documents re-added.
+        """
+        self.flush()
+        if not self.collection:
+            return 0
+        
+        ids, embeddings, documents, metadatas = [], [], [], []
+        while True:
+            page = self.collection.get(
+                offset=len(ids),
+                limit=batch_size,
+                include=['embeddings', 'documents', 'metadatas']
+            )
+            if not page['ids']:
+                break
+            ids.extend(page['ids'])
+            embeddings.extend(np.asarray(page['embeddings'], dtype=np.float32))
+            documents.extend(page['documents'])
+            metadatas.extend(page['metadatas'])
+        
+        self.chroma_client.delete_collection(name=COLLECTION_NAME)
+        self._collection = self.chroma_client.create_collection(name=COLLECTION_NAME, metadata=HNSW_METADATA)
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self._collection.add(
+                ids=ids[start:end],
+                embeddings=[embedding.tolist() for embedding in embeddings[start:end]],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end]
+            )
+        
+        logging.info(f"Rebuilt vector store index with {len(ids)} documents")
+        return len(ids)
     
     def generate_embedding(self, text: str) -> Optional[List[float]]:
         """Generate embedding for given text"""
@@ -58,30 +154,227 @@ class EmbeddingManager:
             if not text:
                 return None
             
-            # Generate embedding
-            embedding = self.model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            embeddings = self._embed_cached([text])
+            return embeddings[0].tolist() if embeddings is not None else None
             
         except Exception as e:
             logging.error(f"Error generating embedding: {str(e)}")
             return None
     
-    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
-        """Calculate cosine similarity between two embeddings"""
+    def embed_batch(self, texts: List[str], batch_size: int = 64) -> Optional[np.ndarray]:
+        """Generate unit-length embeddings for many texts in one model call, as an (N, D) float32 matrix"""
+        if not self.model or not texts:
+            return None
+        
         try:
-            # Convert to numpy arrays
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
+            embeddings = self.model.encode(
+                [text.strip() for text in texts],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            return embeddings.astype(np.float32, copy=False)
             
-            # Calculate cosine similarity
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
+        except Exception as e:
+            logging.error(f"Error generating batch embeddings: {str(e)}")
+            return None
+    
+    def _embed_cached(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Embeddings for stripped, non-empty texts, encoding only those not seen recently"""
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+        embeddings = [None] * len(texts)
+        with self._embedding_cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(key)
+                    embeddings[i] = cached
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = self.embed_batch([texts[i] for i in missing])
+            if computed is None:
+                return None
             
-            if norm1 == 0 or norm2 == 0:
+            with self._embedding_cache_lock:
+                for i, embedding in zip(missing, computed):
+                    embeddings[i] = embedding.copy()
+                    self._embedding_cache[keys[i]] = embeddings[i]
+                    if len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                        self._embedding_cache.popitem(last=False)
+        
+        return np.stack(embeddings)
+    
+    def content_hash(self, text: str) -> str:
+        """Hash identifying an embedding: the model plus the normalized text"""
+        return hashlib.sha256(f"{self.model_name}\x1f{text.strip()}".encode('utf-8')).hexdigest()
+    
+    def _queue_write(self, doc_type: str, doc_id: int, text: str, metadata: Dict):
+        """Buffer one document for the next batched write"""
+        with self._pending_lock:
+            self._pending_writes.append((doc_type, doc_id, text, metadata, 0))
+            if len(self._pending_writes) < self.WRITE_BATCH_SIZE:
+                self._schedule_flush()
+                return
+        
+        self.flush()
+    
+    def _schedule_flush(self):
+        """Start the flush timer if none is pending; call with _pending_lock held"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.WRITE_FLUSH_SECONDS, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush_for(self, doc_type: Optional[str] = None, doc_ids: Optional[set] = None):
+        """Flush only when a buffered or in-flight document matches what a read is about to query"""
+        with self._pending_lock:
+            needed = any(
+                (doc_type is None or item[0] == doc_type)
+                and (doc_ids is None or f"{item[0]}_{item[1]}" in doc_ids)
+                for item in self._pending_writes + self._flushing_writes
+            )
+        if needed:
+            self.flush()
+    
+    def _requeue_writes(self, failed: List[Tuple]):
+        """Put failed documents back at the front of the buffer, dropping those out of attempts"""
+        retry = [item[:4] + (item[4] + 1,) for item in failed if item[4] + 1 < self.WRITE_MAX_ATTEMPTS]
+        dropped = [f"{doc_type}_{doc_id}" for doc_type, doc_id, _, _, attempts in failed
+                   if attempts + 1 >= self.WRITE_MAX_ATTEMPTS]
+        if dropped:
+            logging.error(f"Dropped embeddings after {self.WRITE_MAX_ATTEMPTS} failed writes: {', '.join(dropped)}")
+        if retry:
+            with self._pending_lock:
+                self._pending_writes[:0] = retry
+                self._schedule_flush()
+    
+    def _pending_embeddings(self, pending: List[Tuple]) -> Optional[List[List[float]]]:
+        """Embeddings for buffered documents, reusing stored ones of identical text"""
+        hashes = [metadata['content_hash'] for _, _, _, metadata, _ in pending]
+        stored = {}
+        try:
+            unique_hashes = list(set(hashes))
+            hash_filter = unique_hashes[0] if len(unique_hashes) == 1 else {'$in': unique_hashes}
+            existing = self.collection.get(
+                where={'content_hash': hash_filter},
+                include=['embeddings', 'metadatas']
+            )
+            stored = {
+                metadata['content_hash']: list(embedding)
+                for metadata, embedding in zip(existing['metadatas'], existing['embeddings'])
+            }
+        except Exception as e:
+            logging.warning(f"Embedding cache lookup failed: {str(e)}")
+        
+        embeddings = [stored.get(content_hash) for content_hash in hashes]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = self._embed_cached([pending[i][2].strip() for i in missing])
+            if computed is None:
+                return None
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding.tolist()
+        return embeddings
+    
+    def _add_pending(self, pending: List[Tuple], embeddings: List[List[float]]):
+        """Add buffered documents to the collection in one call"""
+        self.collection.add(
+            embeddings=embeddings,
+            documents=[text[:1000] for _, _, text, _, _ in pending],  # Store first 1000 chars as document
+            metadatas=[metadata for _, _, _, metadata, _ in pending],
+            ids=[f"{doc_type}_{doc_id}" for doc_type, doc_id, _, _, _ in pending]
+        )
+    
+    def flush(self) -> int:
+        """Write all buffered documents to the collection with one model call and one add.
+
+        Stored embeddings of identical text (e.g. a re-uploaded resume) are
+        reused instead of recomputed. If the batched add fails, documents are
+        added one at a time; those that still fail are requeued for up to
+        WRITE_MAX_ATTEMPTS flushes. Returns the number of documents written.
+        """
+        # Serialized so a read that flushes first also waits for a write already in progress
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending_writes = self._pending_writes, []
+                self._flushing_writes = pending
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            
+            try:
+                return self._write_pending(pending)
+            finally:
+                with self._pending_lock:
+                    self._flushing_writes = []
+    
+    def _write_pending(self, pending: List[Tuple]) -> int:
+        """Body of ``flush()`` for the documents it took from the buffer"""
+        if not pending:
+            return 0
+        if not self.collection:
+            self._requeue_writes(pending)
+            return 0
+        
+        try:
+            embeddings = self._pending_embeddings(pending)
+        except Exception as e:
+            logging.error(f"Error embedding buffered documents: {str(e)}")
+            embeddings = None
+        if embeddings is None:
+            logging.error(f"Could not embed {len(pending)} buffered documents")
+            self._requeue_writes(pending)
+            return 0
+        
+        try:
+            self._add_pending(pending, embeddings)
+            logging.info(f"Stored {len(pending)} buffered embeddings")
+            return len(pending)
+        except Exception as e:
+            logging.warning(f"Batched embedding write failed, writing one at a time: {str(e)}")
+        
+        failed = []
+        for item, embedding in zip(pending, embeddings):
+            try:
+                self._add_pending([item], [embedding])
+            except Exception as e:
+                logging.error(f"Error storing {item[0]} {item[1]} embedding: {str(e)}")
+                failed.append(item)
+        self._requeue_writes(failed)
+        
+        logging.info(f"Stored {len(pending) - len(failed)} buffered embeddings")
+        return len(pending) - len(failed)
+    
+    @staticmethod
+    def _cosine_normalized(vec1: np.ndarray, vec2: np.ndarray) -> float:
+        """Similarity percentage of two unit-length embeddings: the dot product is the cosine"""
+        similarity = float(np.dot(vec1, vec2))
+        return float(max(0, min(100, (similarity + 1) * 50)))
+    
+    def calculate_similarity(self, embedding1: List[float], embedding2: List[float],
+                             normalized: bool = False) -> float:
+        """Calculate cosine similarity between two embeddings.
+
+        Pass ``normalized=True`` when both come from this manager's model
+        (always unit length) to skip the norm computation.
+        """
+        try:
+            # float32 matches the stored embeddings and halves the bytes read
+            vec1 = np.asarray(embedding1, dtype=np.float32)
+            vec2 = np.asarray(embedding2, dtype=np.float32)
+            
+            if normalized:
+                return self._cosine_normalized(vec1, vec2)
+            
+            # Cosine similarity with a single square root for both norms
+            dot_product = float(np.vdot(vec1, vec2))
+            denominator = float(np.sqrt(np.vdot(vec1, vec1) * np.vdot(vec2, vec2)))
+            
+            if denominator == 0:
                 return 0.0
             
-            similarity = dot_product / (norm1 * norm2)
+            similarity = dot_product / denominator
             
             # Convert to percentage and ensure it's between 0 and 100
             similarity_percentage = max(0, min(100, (similarity + 1) * 50))
@@ -92,6 +385,85 @@ class EmbeddingManager:
             logging.error(f"Error calculating similarity: {str(e)}")
             return 0.0
     
+    def similarity_scores(self, matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row of ``matrix`` with ``vector``, as 0-100 percentages"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+        
+        # One matrix-vector product for all rows; zero vectors score 0 like calculate_similarity
+        dot_products = matrix @ vector
+        scores = np.zeros(len(matrix), dtype=np.float32)
+        nonzero = norms > 0
+        scores[nonzero] = np.clip((dot_products[nonzero] / norms[nonzero] + 1) * 50, 0, 100)
+        return scores
+    
+    def get_embeddings(self, doc_ids: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch stored embeddings by document id in a single lookup"""
+        self._flush_for(doc_ids=set(doc_ids))
+        if not doc_ids or not self.collection:
+            return {}
+        
+        try:
+            results = self.collection.get(ids=doc_ids, include=['embeddings'])
+            return {
+                doc_id: np.asarray(embedding, dtype=np.float32)
+                for doc_id, embedding in zip(results['ids'], results['embeddings'])
+            }
+            
+        except Exception as e:
+            logging.error(f"Error fetching embeddings: {str(e)}")
+            return {}
+    
+    def document_vectors(self, doc_type: str, items: List[Tuple[int, str]]) -> Dict[int, np.ndarray]:
+        """Vectors for ``(id, text)`` pairs: stored ones by id, the rest embedded from their text (not stored)"""
+        stored = self.get_embeddings([f"{doc_type}_{doc_id}" for doc_id, _ in items])
+        vectors = {doc_id: stored[f"{doc_type}_{doc_id}"] for doc_id, _ in items if f"{doc_type}_{doc_id}" in stored}
+        missing = [(doc_id, text.strip()) for doc_id, text in items
+                   if doc_id not in vectors and text and text.strip()]
+        if missing:
+            computed = self._embed_cached([text for _, text in missing])
+            if computed is not None:
+                vectors.update(zip([doc_id for doc_id, _ in missing], computed))
+        return vectors
+    
+    def job_similarities(self, resume_id: int, resume_text: str,
+                         jobs: List[Tuple[int, str]]) -> Dict[int, float]:
+        """Embedding similarity percentage of one resume to each ``(job_id, text)``.
+
+        Gives the same values as ``similarity_scores`` on the stored vectors, so
+        every scoring path feeds the scorer the same embedding similarity.
+        Jobs that cannot be embedded are absent from the result.
+        """
+        try:
+            resume_vector = self.document_vectors('resume', [(resume_id, resume_text)]).get(resume_id)
+            if resume_vector is None or not jobs:
+                return {}
+            
+            job_vectors = self.document_vectors('job', jobs)
+            job_ids = [job_id for job_id, _ in jobs if job_id in job_vectors]
+            if not job_ids:
+                return {}
+            
+            scores = self.similarity_scores(np.stack([job_vectors[job_id] for job_id in job_ids]), resume_vector)
+            return dict(zip(job_ids, scores.tolist()))
+            
+        except Exception as e:
+            logging.error(f"Error calculating resume/job embedding similarity: {str(e)}")
+            return {}
+    
+    def get_resume_embeddings(self, resume_ids: List[int]) -> Tuple[List[int], np.ndarray]:
+        """Stored embeddings for ``resume_ids`` as an (N, D) float32 matrix.
+
+        Resumes without a stored embedding are skipped; the returned id list
+        gives the row order of the matrix.
+        """
+        stored = self.get_embeddings([f"resume_{resume_id}" for resume_id in resume_ids])
+        found_ids = [resume_id for resume_id in resume_ids if f"resume_{resume_id}" in stored]
+        if not found_ids:
+            return [], np.empty((0, self.embedding_dimension), dtype=np.float32)
+        
+        return found_ids, np.stack([stored[f"resume_{resume_id}"] for resume_id in found_ids])
+    
     def store_resume_embedding(self, resume_id: int, resume_text: str, 
                              metadata: Dict = None) -> bool:
         """Store resume embedding in vector database"""
@@ -99,8 +471,7 @@ class EmbeddingManager:
             return False
         
         try:
-            embedding = self.generate_embedding(resume_text)
-            if not embedding:
+            if not resume_text or not resume_text.strip():
                 return False
             
             # Prepare metadata
@@ -108,24 +479,62 @@ class EmbeddingManager:
             meta.update({
                 'type': 'resume',
                 'resume_id': resume_id,
-                'text_length': len(resume_text)
+                'text_length': len(resume_text),
+                'content_hash': self.content_hash(resume_text)
             })
             
-            # Store in ChromaDB
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[resume_text[:1000]],  # Store first 1000 chars as document
-                metadatas=[meta],
-                ids=[f"resume_{resume_id}"]
-            )
-            
-            logging.info(f"Stored embedding for resume {resume_id}")
+            # Written to ChromaDB with the next batch
+            self._queue_write('resume', resume_id, resume_text, meta)
             return True
             
         except Exception as e:
             logging.error(f"Error storing resume embedding: {str(e)}")
             return False
     
+    def _store_embeddings(self, doc_type: str, items: List[Tuple[int, str]]) -> Tuple[List[int], np.ndarray]:
+        """Embed ``(id, text)`` pairs of one document type with one model call and one collection write.
+
+        Returns the stored ids and their (N, D) float32 matrix; items with
+        empty text are skipped.
+        """
+        empty = ([], np.empty((0, self.embedding_dimension), dtype=np.float32))
+        items = [(doc_id, text) for doc_id, text in items if text and text.strip()]
+        if not items or not self.collection:
+            return empty
+        
+        try:
+            embeddings = self.embed_batch([text for _, text in items])
+            if embeddings is None:
+                return empty
+            
+            doc_ids = [doc_id for doc_id, _ in items]
+            self.collection.add(
+                embeddings=embeddings.tolist(),
+                documents=[text[:1000] for _, text in items],
+                metadatas=[{
+                    'type': doc_type,
+                    f'{doc_type}_id': doc_id,
+                    'text_length': len(text),
+                    'content_hash': self.content_hash(text)
+                } for doc_id, text in items],
+                ids=[f"{doc_type}_{doc_id}" for doc_id in doc_ids]
+            )
+            
+            logging.info(f"Stored embeddings for {len(doc_ids)} {doc_type}s")
+            return doc_ids, embeddings
+            
+        except Exception as e:
+            logging.error(f"Error storing {doc_type} embeddings: {str(e)}")
+            return empty
+    
+    def store_resume_embeddings(self, resumes: List[Tuple[int, str]]) -> Tuple[List[int], np.ndarray]:
+        """Embed and store several ``(resume_id, text)`` pairs with one model call.
+
+        Returns the stored ids and their (N, D) float32 matrix, in the same
+        shape as ``get_resume_embeddings``; resumes with empty text are skipped.
+        """
+        return self._store_embeddings('resume', resumes)
+    
     def store_job_embedding(self, job_id: int, job_text: str, 
                           metadata: Dict = None) -> bool:
         """Store job description embedding in vector database"""
@@ -133,8 +542,7 @@ class EmbeddingManager:
             return False
         
         try:
-            embedding = self.generate_embedding(job_text)
-            if not embedding:
+            if not job_text or not job_text.strip():
                 return False
             
             # Prepare metadata
@@ -142,57 +550,80 @@ class EmbeddingManager:
             meta.update({
                 'type': 'job',
                 'job_id': job_id,
-                'text_length': len(job_text)
+                'text_length': len(job_text),
+                'content_hash': self.content_hash(job_text)
             })
             
-            # Store in ChromaDB
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[job_text[:1000]],  # Store first 1000 chars as document
-                metadatas=[meta],
-                ids=[f"job_{job_id}"]
-            )
-            
-            logging.info(f"Stored embedding for job {job_id}")
+            # Written to ChromaDB with the next batch
+            self._queue_write('job', job_id, job_text, meta)
             return True
             
         except Exception as e:
             logging.error(f"Error storing job embedding: {str(e)}")
             return False
     
-    def find_similar_resumes(self, job_text: str, limit: int = 10) -> List[Dict]:
-        """Find resumes similar to job description"""
+    def store_job_embeddings(self, jobs: List[Tuple[int, str]]) -> Tuple[List[int], np.ndarray]:
+        """Embed and store several ``(job_id, text)`` pairs with one model call"""
+        return self._store_embeddings('job', jobs)
+    
+    def nearest_job_ids(self, vector: np.ndarray, limit: int = 10) -> List[int]:
+        """Ids of the stored jobs nearest to ``vector`` in the HNSW index, nearest first"""
+        self._flush_for('job')
         if not self.collection:
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(job_text)
-            if not query_embedding:
-                return []
-            
-            # Query similar documents
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=[np.asarray(vector, dtype=np.float32).tolist()],
                 n_results=limit,
-                where={"type": "resume"}
+                where={"type": "job"},
+                include=[]
             )
+            return [int(doc_id[len("job_"):]) for doc_id in results['ids'][0]] if results['ids'] else []
             
-            # Process results
-            similar_resumes = []
-            if results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    similarity = 1 - results['distances'][0][i]  # Convert distance to similarity
-                    metadata = results['metadatas'][0][i]
-                    
-                    similar_resumes.append({
-                        'resume_id': metadata.get('resume_id'),
-                        'similarity': similarity,
-                        'similarity_percentage': similarity * 100,
-                        'metadata': metadata
-                    })
-            
-            return similar_resumes
+        except Exception as e:
+            logging.error(f"Error querying nearest jobs: {str(e)}")
+            return []
+    
+    def _find_similar(self, text: str, doc_type: str, limit: int) -> List[Dict]:
+        """Stored documents of ``doc_type`` nearest to ``text``, nearest first"""
+        self._flush_for(doc_type)
+        
+        # Generate query embedding
+        query_embedding = self.generate_embedding(text)
+        if not query_embedding:
+            return []
+        
+        # Query similar documents; the stored document text is not needed
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=limit,
+            where={"type": doc_type},
+            include=["metadatas", "distances"]
+        )
+        if not results['ids'] or not results['ids'][0]:
+            return []
+        
+        # Convert all cosine distances to similarities at once
+        similarities = 1.0 - np.asarray(results['distances'][0], dtype=np.float32)
+        id_key = f'{doc_type}_id'
+        return [
+            {
+                id_key: metadata.get(id_key),
+                'similarity': float(similarity),
+                'similarity_percentage': float(similarity * 100),
+                'metadata': metadata
+            }
+            for similarity, metadata in zip(similarities, results['metadatas'][0])
+        ]
+    
+    def find_similar_resumes(self, job_text: str, limit: int = 10) -> List[Dict]:
+        """Find resumes similar to job description"""
+        if not self.collection:
+            return []
+        
+        try:
+            return self._find_similar(job_text, 'resume', limit)
             
         except Exception as e:
             logging.error(f"Error finding similar resumes: {str(e)}")
@@ -204,33 +635,7 @@ class EmbeddingManager:
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(resume_text)
-            if not query_embedding:
-                return []
-            
-            # Query similar documents
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                where={"type": "job"}
-            )
-            
-            # Process results
-            similar_jobs = []
-            if results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    similarity = 1 - results['distances'][0][i]  # Convert distance to similarity
-                    metadata = results['metadatas'][0][i]
-                    
-                    similar_jobs.append({
-                        'job_id': metadata.get('job_id'),
-                        'similarity': similarity,
-                        'similarity_percentage': similarity * 100,
-                        'metadata': metadata
-                    })
-            
-            return similar_jobs
+            return self._find_similar(resume_text, 'job', limit)
             
         except Exception as e:
             logging.error(f"Error finding similar jobs: {str(e)}")
@@ -239,13 +644,17 @@ class EmbeddingManager:
     def get_semantic_similarity(self, resume_text: str, job_text: str) -> float:
         """Get semantic similarity between resume and job description"""
         try:
-            resume_embedding = self.generate_embedding(resume_text)
-            job_embedding = self.generate_embedding(job_text)
+            resume_text = resume_text.strip()
+            job_text = job_text.strip()
+            if not resume_text or not job_text:
+                return 0.0
             
-            if not resume_embedding or not job_embedding:
+            # Texts not seen recently go through the model in a single forward pass
+            embeddings = self._embed_cached([resume_text, job_text])
+            if embeddings is None:
                 return 0.0
             
-            similarity = self.calculate_similarity(resume_embedding, job_embedding)
+            similarity = self.calculate_similarity(embeddings[0], embeddings[1], normalized=True)
             return similarity
             
         except Exception as e:
@@ -254,6 +663,7 @@ class EmbeddingManager:
     
     def delete_resume_embedding(self, resume_id: int) -> bool:
         """Delete resume embedding from vector store"""
+        self.flush()
         if not self.collection:
             return False
         
@@ -267,6 +677,7 @@ class EmbeddingManager:
     
     def delete_job_embedding(self, job_id: int) -> bool:
         """Delete job embedding from vector store"""
+        self.flush()
         if not self.collection:
             return False
         
@@ -280,6 +691,7 @@ class EmbeddingManager:
     
     def get_collection_stats(self) -> Dict:
         """Get statistics about the vector store collection"""
+        self.flush()
         if not self.collection:
             return {'error': 'Collection not available'}
         
@@ -0,0 +1,38 @@
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    orjson serializes datetimes, dates and numpy values natively, so rows
+    fetched through SQLAlchemy Core can be returned without per-field
+    conversion.
+    """
+    
+    def _options(self):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+_RESPONSE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def orjson_dumps(obj) -> bytes:
+    """Serialize ``obj`` to JSON bytes with the response options"""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_RESPONSE_OPTIONS)
+
+def orjson_response(obj, status=200):
+    """Serialize ``obj`` with orjson straight into a JSON response"""
+    return Response(orjson_dumps(obj), status=status, mimetype='application/json')
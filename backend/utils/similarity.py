@@ -1,12 +1,66 @@
 import numpy as np
-from typing import List, Dict, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from rank_bm25 import BM25Okapi
+from typing import List, Dict, Tuple, NamedTuple, FrozenSet, Union
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer
 import re
+import math
 import logging
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+# Maps each ASCII character matched by [^\w\s] to a space, for str.translate
+_PUNCT_TABLE = str.maketrans({
+    c: ' ' for c in map(chr, range(128)) if re.match(r'[^\w\s]', c)
+})
+
+# Non-word, non-space characters, for text outside ASCII
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s]')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=512)
+def _preprocess(text: str) -> str:
+    """Punctuation to spaces, whitespace collapsed, lowercased"""
+    # Remove special characters but keep alphanumeric and spaces
+    if text.isascii():
+        text = text.translate(_PUNCT_TABLE)
+    else:
+        text = _SPECIAL_CHARS_RE.sub(' ', text)
+    # Remove extra whitespace and convert to lowercase
+    return _WHITESPACE_RE.sub(' ', text).lower().strip()
+
+@lru_cache(maxsize=512)
+def _tokenize(text: str) -> Tuple[str, ...]:
+    """Words of the preprocessed text"""
+    return tuple(_preprocess(text).split())
+
+# Stateless and L2-normalized: no per-pair fit, and the cosine is a plain dot product
+_HASHING_VECTORIZER = HashingVectorizer(
+    n_features=2 ** 18,
+    alternate_sign=False,
+    ngram_range=(1, 2),
+    stop_words='english',
+    lowercase=True,
+    norm='l2'
+)
+
+@lru_cache(maxsize=512)
+def _hashed_terms(processed: str):
+    """Hashed term-frequency row of a preprocessed text; callers must not modify it"""
+    return _HASHING_VECTORIZER.transform([processed])
+
+class PreparedText(NamedTuple):
+    """A text preprocessed once for all similarity metrics"""
+    processed: str
+    tokens: Tuple[str, ...]
+    token_set: FrozenSet[str]
 
 class SimilarityCalculator:
+    # BM25Okapi defaults
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    BM25_EPSILON = 0.25
+    
     def __init__(self):
         self.tfidf_vectorizer = TfidfVectorizer(
             stop_words='english',
@@ -26,52 +80,46 @@ class SimilarityCalculator:
     
     def preprocess_text(self, text: str) -> str:
         """Preprocess text for similarity calculation"""
-        # Remove special characters but keep alphanumeric and spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Convert to lowercase
-        text = text.lower().strip()
-        return text
+        return _preprocess(text)
     
     def tokenize_text(self, text: str) -> List[str]:
         """Tokenize text into words"""
-        preprocessed = self.preprocess_text(text)
-        return preprocessed.split()
+        return list(_tokenize(text))
     
-    def calculate_tfidf_similarity(self, text1: str, text2: str) -> Dict:
-        """Calculate TF-IDF cosine similarity between two texts"""
+    def _prepare(self, text: Union[str, PreparedText]) -> PreparedText:
+        """Preprocess and tokenize a text once; prepared texts pass through unchanged"""
+        if isinstance(text, PreparedText):
+            return text
+        tokens = _tokenize(text)
+        return PreparedText(_preprocess(text), tokens, frozenset(tokens))
+    
+    def calculate_tfidf_similarity(self, text1: Union[str, PreparedText], text2: Union[str, PreparedText],
+                                   explain: bool = False) -> Dict:
+        """Calculate term-frequency cosine similarity between two texts.
+
+        A TF-IDF fit on just two documents gives degenerate IDF weights, so
+        the score comes from hashed, L2-normalized term frequencies. Pass
+        ``explain=True`` to also fit TF-IDF on the pair for top features.
+        """
         try:
-            # Preprocess texts
-            processed_text1 = self.preprocess_text(text1)
-            processed_text2 = self.preprocess_text(text2)
+            # Create corpus from the preprocessed texts
+            corpus = [self._prepare(text1).processed, self._prepare(text2).processed]
             
-            # Create corpus
-            corpus = [processed_text1, processed_text2]
+            # Rows are unit length, so their dot product is the cosine; each text
+            # is hashed once even when compared against many others
+            similarity_score = min(_hashed_terms(corpus[0]).multiply(_hashed_terms(corpus[1])).sum(), 1.0)
             
-            # Fit TF-IDF vectorizer
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(corpus)
-            
-            # Calculate cosine similarity
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            similarity_score = similarity_matrix[0][1]
-            
-            # Get feature importance
-            feature_names = self.tfidf_vectorizer.get_feature_names_out()
-            tfidf_scores = tfidf_matrix.toarray()
-            
-            # Get top features for each text
-            text1_features = self._get_top_features(tfidf_scores[0], feature_names, top_n=10)
-            text2_features = self._get_top_features(tfidf_scores[1], feature_names, top_n=10)
-            
-            return {
+            result = {
                 'similarity_score': float(similarity_score),
                 'similarity_percentage': float(similarity_score * 100),
-                'text1_top_features': text1_features,
-                'text2_top_features': text2_features,
-                'method': 'tfidf_cosine'
+                'method': 'hashed_tf_cosine'
             }
             
+            if explain:
+                result['text1_top_features'], result['text2_top_features'] = self._pair_top_features(corpus)
+            
+            return result
+            
         except Exception as e:
             logging.error(f"Error calculating TF-IDF similarity: {str(e)}")
             return {
@@ -80,22 +128,29 @@ class SimilarityCalculator:
                 'error': str(e)
             }
     
-    def calculate_bm25_similarity(self, text1: str, text2: str) -> Dict:
+    def _pair_top_features(self, corpus: List[str]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """Top TF-IDF features of each text in a two-document corpus"""
+        try:
+            # Get feature importance
+            tfidf_matrix = self.tfidf_vectorizer.fit_transform(corpus)
+        except ValueError:
+            # Every term was pruned, e.g. the two texts share their whole vocabulary
+            return [], []
+        
+        # Rows stay sparse: only each text's own terms are ranked
+        feature_names = self.tfidf_vectorizer.get_feature_names_out()
+        return (
+            self._get_top_features(tfidf_matrix.getrow(0), feature_names, top_n=10),
+            self._get_top_features(tfidf_matrix.getrow(1), feature_names, top_n=10)
+        )
+    
+    def calculate_bm25_similarity(self, text1: Union[str, PreparedText], text2: Union[str, PreparedText]) -> Dict:
         """Calculate BM25 similarity between two texts"""
         try:
-            # Tokenize texts
-            tokens1 = self.tokenize_text(text1)
-            tokens2 = self.tokenize_text(text2)
-            
-            # Create corpus
-            corpus = [tokens1, tokens2]
-            
-            # Initialize BM25
-            bm25 = BM25Okapi(corpus)
-            
             # Calculate scores
-            score1_vs_2 = bm25.get_scores(tokens2)[0]  # How well text1 matches text2 query
-            score2_vs_1 = bm25.get_scores(tokens1)[1]  # How well text2 matches text1 query
+            score1_vs_2, score2_vs_1 = self._pairwise_bm25(
+                self._prepare(text1).tokens, self._prepare(text2).tokens
+            )
             
             # Average the scores for bidirectional similarity
             avg_score = (score1_vs_2 + score2_vs_1) / 2
@@ -121,32 +176,58 @@ class SimilarityCalculator:
                 'error': str(e)
             }
     
-    def calculate_jaccard_similarity(self, text1: str, text2: str) -> Dict:
+    def _pairwise_bm25(self, tokens1: Tuple[str, ...], tokens2: Tuple[str, ...]) -> Tuple[float, float]:
+        """BM25Okapi scores of a two-document corpus, without building the index.
+
+        Returns how well text1 matches text2 as a query, and the reverse. In a
+        two-document corpus a term in one document has idf log(1.5/1.5) = 0,
+        so only shared terms score, all with the epsilon-floored idf.
+        """
+        freqs1 = Counter(tokens1)
+        freqs2 = Counter(tokens2)
+        shared = freqs1.keys() & freqs2.keys()
+        if not shared:
+            return 0.0, 0.0
+        
+        vocabulary_size = len(freqs1.keys() | freqs2.keys())
+        average_idf = len(shared) * (math.log(0.5) - math.log(2.5)) / vocabulary_size
+        shared_idf = self.BM25_EPSILON * average_idf
+        
+        average_length = (len(tokens1) + len(tokens2)) / 2
+        length_norm1 = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * len(tokens1) / average_length)
+        length_norm2 = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * len(tokens2) / average_length)
+        
+        # Each query token counts once per occurrence, as in BM25Okapi.get_scores
+        score1_vs_2 = shared_idf * sum(
+            freqs2[word] * freqs1[word] * (self.BM25_K1 + 1) / (freqs1[word] + length_norm1) for word in shared
+        )
+        score2_vs_1 = shared_idf * sum(
+            freqs1[word] * freqs2[word] * (self.BM25_K1 + 1) / (freqs2[word] + length_norm2) for word in shared
+        )
+        return score1_vs_2, score2_vs_1
+    
+    def calculate_jaccard_similarity(self, text1: Union[str, PreparedText], text2: Union[str, PreparedText]) -> Dict:
         """Calculate Jaccard similarity between two texts"""
         try:
             # Tokenize texts into sets
-            tokens1 = set(self.tokenize_text(text1))
-            tokens2 = set(self.tokenize_text(text2))
+            tokens1 = self._prepare(text1).token_set
+            tokens2 = self._prepare(text2).token_set
             
-            # Calculate Jaccard similarity
-            intersection = len(tokens1.intersection(tokens2))
-            union = len(tokens1.union(tokens2))
+            # Calculate Jaccard similarity; the union size follows from the intersection
+            common = tokens1 & tokens2
+            intersection = len(common)
+            union = len(tokens1) + len(tokens2) - intersection
             
             jaccard_score = intersection / union if union > 0 else 0.0
             
-            # Find common and unique tokens
-            common_tokens = list(tokens1.intersection(tokens2))
-            unique_to_text1 = list(tokens1 - tokens2)
-            unique_to_text2 = list(tokens2 - tokens1)
-            
             return {
                 'jaccard_score': float(jaccard_score),
                 'similarity_percentage': float(jaccard_score * 100),
                 'intersection_size': intersection,
                 'union_size': union,
-                'common_tokens': common_tokens[:20],  # Top 20 common tokens
-                'unique_to_text1': unique_to_text1[:10],  # Top 10 unique to text1
-                'unique_to_text2': unique_to_text2[:10],  # Top 10 unique to text2
+                'common_tokens': list(islice(common, 20)),  # Top 20 common tokens
+                'unique_to_text1': self._first_missing(tokens1, common, 10),  # Top 10 unique to text1
+                'unique_to_text2': self._first_missing(tokens2, common, 10),  # Top 10 unique to text2
                 'method': 'jaccard'
             }
             
@@ -158,18 +239,15 @@ class SimilarityCalculator:
                 'error': str(e)
             }
     
-    def calculate_word_overlap(self, text1: str, text2: str) -> Dict:
+    def calculate_word_overlap(self, text1: Union[str, PreparedText], text2: Union[str, PreparedText]) -> Dict:
         """Calculate word overlap metrics between two texts"""
         try:
-            tokens1 = self.tokenize_text(text1)
-            tokens2 = self.tokenize_text(text2)
-            
-            # Convert to sets for overlap calculation
-            set1 = set(tokens1)
-            set2 = set(tokens2)
+            # Sets for overlap calculation
+            set1 = self._prepare(text1).token_set
+            set2 = self._prepare(text2).token_set
             
             # Calculate overlaps
-            overlap = len(set1.intersection(set2))
+            overlap = len(set1 & set2)
             overlap_ratio_1 = overlap / len(set1) if len(set1) > 0 else 0.0
             overlap_ratio_2 = overlap / len(set2) if len(set2) > 0 else 0.0
             
@@ -198,11 +276,15 @@ class SimilarityCalculator:
     def calculate_comprehensive_similarity(self, text1: str, text2: str) -> Dict:
         """Calculate multiple similarity metrics and return comprehensive results"""
         try:
+            # Preprocess and tokenize each text once for every metric
+            prepared1 = self._prepare(text1)
+            prepared2 = self._prepare(text2)
+            
             # Calculate different similarity metrics
-            tfidf_result = self.calculate_tfidf_similarity(text1, text2)
-            bm25_result = self.calculate_bm25_similarity(text1, text2)
-            jaccard_result = self.calculate_jaccard_similarity(text1, text2)
-            overlap_result = self.calculate_word_overlap(text1, text2)
+            tfidf_result = self.calculate_tfidf_similarity(prepared1, prepared2)
+            bm25_result = self.calculate_bm25_similarity(prepared1, prepared2)
+            jaccard_result = self.calculate_jaccard_similarity(prepared1, prepared2)
+            overlap_result = self.calculate_word_overlap(prepared1, prepared2)
             
             # Calculate weighted average similarity
             similarities = [
@@ -231,10 +313,10 @@ class SimilarityCalculator:
                     'word_overlap': overlap_result
                 },
                 'text_statistics': {
-                    'text1_word_count': len(self.tokenize_text(text1)),
-                    'text2_word_count': len(self.tokenize_text(text2)),
-                    'text1_unique_words': len(set(self.tokenize_text(text1))),
-                    'text2_unique_words': len(set(self.tokenize_text(text2)))
+                    'text1_word_count': len(prepared1.tokens),
+                    'text2_word_count': len(prepared2.tokens),
+                    'text1_unique_words': len(prepared1.token_set),
+                    'text2_unique_words': len(prepared2.token_set)
                 }
             }
             
@@ -245,51 +327,57 @@ class SimilarityCalculator:
                 'error': str(e)
             }
     
-    def _get_top_features(self, tfidf_scores: np.ndarray, feature_names: np.ndarray, 
+    @staticmethod
+    def _first_missing(tokens: FrozenSet[str], excluded: FrozenSet[str], limit: int) -> List[str]:
+        """Up to ``limit`` tokens not in ``excluded``, without building the full difference"""
+        return list(islice((token for token in tokens if token not in excluded), limit))
+    
+    def _get_top_features(self, tfidf_row, feature_names: np.ndarray,
                          top_n: int = 10) -> List[Tuple[str, float]]:
-        """Get top N features from TF-IDF scores"""
+        """Get top N features from a sparse row of TF-IDF scores"""
         try:
-            # Get indices of top features
-            top_indices = tfidf_scores.argsort()[-top_n:][::-1]
-            
-            # Get feature names and scores
-            top_features = []
-            for idx in top_indices:
-                if tfidf_scores[idx] > 0:  # Only include features with positive scores
-                    top_features.append((feature_names[idx], float(tfidf_scores[idx])))
-            
-            return top_features
+            # Only the stored (non-zero) entries are ranked
+            scores = tfidf_row.data
+            columns = tfidf_row.indices
+            top_indices = np.argsort(-scores, kind='stable')[:top_n]
+            
+            # Get feature names and scores, keeping only positive ones
+            return [
+                (feature_names[columns[idx]], float(scores[idx]))
+                for idx in top_indices
+                if scores[idx] > 0
+            ]
             
         except Exception as e:
             logging.error(f"Error getting top features: {str(e)}")
             return []
     
-    def find_key_differences(self, text1: str, text2: str) -> Dict:
+    def find_key_differences(self, text1: Union[str, PreparedText], text2: Union[str, PreparedText]) -> Dict:
         """Find key differences between two texts"""
         try:
-            tokens1 = set(self.tokenize_text(text1))
-            tokens2 = set(self.tokenize_text(text2))
+            tokens1 = self._prepare(text1).token_set
+            tokens2 = self._prepare(text2).token_set
             
-            # Find differences
-            only_in_text1 = list(tokens1 - tokens2)
-            only_in_text2 = list(tokens2 - tokens1)
-            common_tokens = list(tokens1.intersection(tokens2))
+            # Find differences; every size follows from the intersection
+            common = tokens1 & tokens2
+            text1_unique_count = len(tokens1) - len(common)
+            text2_unique_count = len(tokens2) - len(common)
             
             # Calculate difference metrics
-            total_unique_tokens = len(tokens1.union(tokens2))
-            difference_ratio = len(only_in_text1) + len(only_in_text2)
+            total_unique_tokens = text1_unique_count + text2_unique_count + len(common)
+            difference_ratio = text1_unique_count + text2_unique_count
             difference_percentage = (difference_ratio / total_unique_tokens * 100) if total_unique_tokens > 0 else 0
             
             return {
-                'only_in_text1': only_in_text1[:20],  # Top 20 unique to text1
-                'only_in_text2': only_in_text2[:20],  # Top 20 unique to text2
-                'common_tokens': common_tokens[:20],   # Top 20 common tokens
+                'only_in_text1': self._first_missing(tokens1, common, 20),  # Top 20 unique to text1
+                'only_in_text2': self._first_missing(tokens2, common, 20),  # Top 20 unique to text2
+                'common_tokens': list(islice(common, 20)),   # Top 20 common tokens
                 'difference_percentage': float(difference_percentage),
                 'similarity_percentage': 100 - float(difference_percentage),
                 'total_unique_tokens': total_unique_tokens,
-                'text1_unique_count': len(only_in_text1),
-                'text2_unique_count': len(only_in_text2),
-                'common_count': len(common_tokens)
+                'text1_unique_count': text1_unique_count,
+                'text2_unique_count': text2_unique_count,
+                'common_count': len(common)
             }
             
         except Exception as e:
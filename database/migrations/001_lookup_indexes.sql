@@ -0,0 +1,11 @@
+-- Indexes for evaluation lookup hot paths.
+-- New databases get these from `flask init-db`; run this against existing ones.
+
+CREATE INDEX IF NOT EXISTS ix_eval_job_score_desc ON evaluations (job_id, relevance_score DESC);
+CREATE INDEX IF NOT EXISTS ix_eval_job_verdict ON evaluations (job_id, verdict);
+CREATE INDEX IF NOT EXISTS ix_eval_resume ON evaluations (resume_id);
+CREATE INDEX IF NOT EXISTS ix_eval_verdict ON evaluations (verdict);
+
+CREATE INDEX IF NOT EXISTS ix_resume_student ON resumes (student_id);
+
+CREATE INDEX IF NOT EXISTS ix_job_status_deadline ON jobs (status, application_deadline);
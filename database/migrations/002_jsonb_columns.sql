@@ -0,0 +1,30 @@
+-- Convert JSON columns to JSONB and add GIN indexes for skill containment queries.
+
+BEGIN;
+
+ALTER TABLE evaluations
+    ALTER COLUMN missing_skills TYPE JSONB USING missing_skills::jsonb,
+    ALTER COLUMN missing_projects TYPE JSONB USING missing_projects::jsonb,
+    ALTER COLUMN missing_certifications TYPE JSONB USING missing_certifications::jsonb,
+    ALTER COLUMN missing_experience TYPE JSONB USING missing_experience::jsonb,
+    ALTER COLUMN improvement_suggestions TYPE JSONB USING improvement_suggestions::jsonb,
+    ALTER COLUMN matched_skills TYPE JSONB USING matched_skills::jsonb,
+    ALTER COLUMN skill_gaps TYPE JSONB USING skill_gaps::jsonb;
+
+ALTER TABLE jobs
+    ALTER COLUMN required_skills TYPE JSONB USING required_skills::jsonb,
+    ALTER COLUMN preferred_skills TYPE JSONB USING preferred_skills::jsonb,
+    ALTER COLUMN education_requirements TYPE JSONB USING education_requirements::jsonb,
+    ALTER COLUMN certifications TYPE JSONB USING certifications::jsonb;
+
+ALTER TABLE resumes
+    ALTER COLUMN extracted_skills TYPE JSONB USING extracted_skills::jsonb,
+    ALTER COLUMN extracted_experience TYPE JSONB USING extracted_experience::jsonb,
+    ALTER COLUMN extracted_education TYPE JSONB USING extracted_education::jsonb,
+    ALTER COLUMN extracted_projects TYPE JSONB USING extracted_projects::jsonb,
+    ALTER COLUMN extracted_certifications TYPE JSONB USING extracted_certifications::jsonb;
+
+CREATE INDEX IF NOT EXISTS ix_job_required_skills_gin ON jobs USING gin (required_skills);
+CREATE INDEX IF NOT EXISTS ix_resume_extracted_skills_gin ON resumes USING gin (extracted_skills);
+
+COMMIT;
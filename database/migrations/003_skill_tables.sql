@@ -0,0 +1,59 @@
+-- Normalized skill tables. `flask init-db` creates the tables; this backfills
+-- them from the existing JSONB skill columns (run after 002_jsonb_columns.sql).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS skills (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    skill_id INTEGER NOT NULL REFERENCES skills (id) ON DELETE CASCADE,
+    weight DOUBLE PRECISION NOT NULL DEFAULT 1.0,
+    PRIMARY KEY (job_id, skill_id)
+);
+CREATE INDEX IF NOT EXISTS ix_job_skills_skill ON job_skills (skill_id);
+
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    skill_id INTEGER NOT NULL REFERENCES skills (id) ON DELETE CASCADE,
+    PRIMARY KEY (resume_id, skill_id)
+);
+CREATE INDEX IF NOT EXISTS ix_resume_skills_skill ON resume_skills (skill_id);
+
+INSERT INTO skills (name)
+SELECT DISTINCT lower(btrim(s.name))
+FROM (
+    SELECT jsonb_array_elements_text(required_skills) AS name FROM jobs WHERE jsonb_typeof(required_skills) = 'array'
+    UNION ALL
+    SELECT jsonb_array_elements_text(preferred_skills) FROM jobs WHERE jsonb_typeof(preferred_skills) = 'array'
+    UNION ALL
+    SELECT jsonb_array_elements_text(extracted_skills) FROM resumes WHERE jsonb_typeof(extracted_skills) = 'array'
+) s
+WHERE btrim(s.name) <> '' AND length(btrim(s.name)) <= 200  -- longer entries are free text, not skills
+ON CONFLICT (name) DO NOTHING;
+
+INSERT INTO job_skills (job_id, skill_id, weight)
+SELECT j.id, sk.id, 1.0
+FROM (SELECT id, required_skills FROM jobs WHERE jsonb_typeof(required_skills) = 'array') j
+CROSS JOIN LATERAL jsonb_array_elements_text(j.required_skills) AS r(name)
+JOIN skills sk ON sk.name = lower(btrim(r.name))
+ON CONFLICT DO NOTHING;
+
+INSERT INTO job_skills (job_id, skill_id, weight)
+SELECT j.id, sk.id, 0.5
+FROM (SELECT id, preferred_skills FROM jobs WHERE jsonb_typeof(preferred_skills) = 'array') j
+CROSS JOIN LATERAL jsonb_array_elements_text(j.preferred_skills) AS p(name)
+JOIN skills sk ON sk.name = lower(btrim(p.name))
+ON CONFLICT DO NOTHING;
+
+INSERT INTO resume_skills (resume_id, skill_id)
+SELECT r.id, sk.id
+FROM (SELECT id, extracted_skills FROM resumes WHERE jsonb_typeof(extracted_skills) = 'array') r
+CROSS JOIN LATERAL jsonb_array_elements_text(r.extracted_skills) AS e(name)
+JOIN skills sk ON sk.name = lower(btrim(e.name))
+ON CONFLICT DO NOTHING;
+
+COMMIT;
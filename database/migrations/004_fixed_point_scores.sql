@@ -0,0 +1,16 @@
+-- Store evaluation scores as SMALLINT hundredths (0-10000) instead of DOUBLE PRECISION.
+-- Existing out-of-range scores (e.g. negative BM25-based keyword scores) are clamped.
+
+BEGIN;
+
+ALTER TABLE evaluations
+    ALTER COLUMN relevance_score TYPE SMALLINT USING greatest(0, least(10000, round(relevance_score * 100)))::smallint,
+    ALTER COLUMN keyword_score TYPE SMALLINT USING greatest(0, least(10000, round(keyword_score * 100)))::smallint,
+    ALTER COLUMN semantic_score TYPE SMALLINT USING greatest(0, least(10000, round(semantic_score * 100)))::smallint;
+
+ALTER TABLE evaluations
+    ADD CONSTRAINT ck_eval_relevance_score_range CHECK (relevance_score BETWEEN 0 AND 10000),
+    ADD CONSTRAINT ck_eval_keyword_score_range CHECK (keyword_score BETWEEN 0 AND 10000),
+    ADD CONSTRAINT ck_eval_semantic_score_range CHECK (semantic_score BETWEEN 0 AND 10000);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Composite and partial indexes matching the evaluation filter/sort patterns.
+-- New databases get these from `flask init-db`; run this against existing ones.
+
+CREATE INDEX IF NOT EXISTS ix_eval_verdict_date ON evaluations (verdict, evaluation_date DESC);
+DROP INDEX IF EXISTS ix_eval_verdict;
+
+CREATE INDEX IF NOT EXISTS ix_eval_date_id ON evaluations (evaluation_date DESC, id DESC);
+
+-- Scores are stored x100, so 7500 is a relevance score of 75
+CREATE INDEX IF NOT EXISTS ix_eval_high ON evaluations (relevance_score) WHERE relevance_score >= 7500;
+
+CREATE INDEX IF NOT EXISTS ix_resume_student_upload ON resumes (student_id, upload_date DESC);
+DROP INDEX IF EXISTS ix_resume_student;
@@ -0,0 +1,13 @@
+-- Status rows for background evaluation tasks (polled via /evaluations/status/<task_id>).
+-- New databases get this table from `flask init-db`; run this against existing ones.
+
+CREATE TABLE IF NOT EXISTS evaluation_tasks (
+    id VARCHAR(32) PRIMARY KEY,
+    kind VARCHAR(30) NOT NULL,
+    target_id INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    finished_at TIMESTAMP WITHOUT TIME ZONE
+);
@@ -0,0 +1,4 @@
+-- Preprocessed matcher artifacts stored with each job (ResumeJobMatcher.preprocess_job).
+-- Existing rows stay NULL and are tokenized on the fly until re-uploaded.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS parsed_cache JSONB;
@@ -0,0 +1,9 @@
+-- Persistent LLM response cache used by FeedbackGenerator (models/llm_cache.py).
+-- New databases get this table from `flask init-db`; run this against existing ones.
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key_hash VARCHAR(64) PRIMARY KEY,
+    prompt_version VARCHAR(20) NOT NULL,
+    response TEXT NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE
+);
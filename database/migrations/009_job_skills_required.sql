@@ -0,0 +1,9 @@
+-- Explicit required/preferred flag on job_skills, so matching filters on it
+-- instead of comparing weights. Run after 003_skill_tables.sql.
+
+BEGIN;
+
+ALTER TABLE job_skills ADD COLUMN IF NOT EXISTS required BOOLEAN NOT NULL DEFAULT TRUE;
+UPDATE job_skills SET required = (weight >= 1.0);
+
+COMMIT;
@@ -0,0 +1,4 @@
+-- Heartbeat column for background evaluation tasks; unfinished tasks whose
+-- worker stops updating it are marked failed. Run after 006_evaluation_tasks.sql.
+
+ALTER TABLE evaluation_tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE;
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+# The backend is not an installed package; import its modules by path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from models import db
+
+
+@pytest.fixture
+def app():
+    """Minimal app bound to an in-memory SQLite database with all tables created"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from models import db, Evaluation, Skill
+from services.scorer import RelevanceScorer
+
+
+def _negative_keyword_match():
+    """Match results whose BM25 part is negative, as a two-document BM25 gives for overlapping texts"""
+    return {
+        'exact_skill_match': {'match_percentage': 0, 'matched_skills': [], 'missing_skills': []},
+        'fuzzy_skill_match': {'fuzzy_match_percentage': 0},
+        'bm25_match': {'normalized_score': -30.15},
+        'tfidf_match': {'similarity_percentage': 40.0},
+    }
+
+
+def _evaluation_row(resume_id, scoring_results):
+    return {
+        'resume_id': resume_id,
+        'job_id': 1,
+        'relevance_score': scoring_results['final_score'],
+        'keyword_score': scoring_results['score_breakdown']['keyword_score'],
+        'semantic_score': scoring_results['score_breakdown']['semantic_score'],
+        'verdict': scoring_results['verdict'],
+        'evaluation_date': datetime.utcnow(),
+    }
+
+
+def test_bulk_create_stores_negative_keyword_score_clamped(app):
+    scoring_results = RelevanceScorer().calculate_comprehensive_score(_negative_keyword_match())
+    assert scoring_results['score_breakdown']['keyword_score'] < 0
+
+    good_results = dict(scoring_results, score_breakdown=dict(scoring_results['score_breakdown'], keyword_score=55.5))
+    Evaluation.bulk_create([_evaluation_row(1, scoring_results), _evaluation_row(2, good_results)])
+    db.session.commit()
+
+    stored = {evaluation.resume_id: evaluation for evaluation in db.session.scalars(db.select(Evaluation))}
+    assert sorted(stored) == [1, 2]
+    assert stored[1].keyword_score == 0.0
+    assert stored[2].keyword_score == 55.5
+
+
+def test_score_setter_clamps_to_range():
+    evaluation = Evaluation(relevance_score=120.0, keyword_score=-6.03, semantic_score=None)
+    assert evaluation.relevance_score == 100.0
+    assert evaluation.keyword_score == 0.0
+    assert evaluation.semantic_score is None
+
+
+def test_skill_links_and_matched_counts_on_sqlite(app):
+    Skill.link_job(1, ['Python', 'SQL', 'Docker'], ['Go', 'python'])
+    Skill.link_job(2, ['Rust'])
+    Skill.link_resume(10, ['python', ' Docker ', 'Go', 'x' * 300])
+    db.session.commit()
+    
+    assert Skill.matched_counts(10, [1, 2, 3]) == {1: (2, 3), 2: (0, 1)}
+    assert db.session.scalar(db.select(db.func.count()).select_from(Skill).where(Skill.name == 'x' * 300)) == 0